@@ -1,18 +1,43 @@
-﻿import logging
+﻿import atexit
+import logging
+import logging.handlers
 import os
+import queue
 
 
 def init_logging(log_file: str = None, level: int = logging.INFO):
+    """初始化日志：根 logger 只挂一个 QueueHandler，真正写文件/控制台的 handler 在 QueueListener 的后台线程里跑。
+
+    这样监控 worker 等热路径线程打日志时只是往队列里放一条记录，不会卡在日志文件的 IO/锁上。
+    """
+
     log_dir = os.path.join(os.path.dirname(__file__), 'logs')
     os.makedirs(log_dir, exist_ok=True)
     if log_file is None:
         log_file = os.path.join(log_dir, 'app.log')
+
+    formatter = logging.Formatter(
+        fmt='%(asctime)s %(levelname)s %(name)s: %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+    )
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        file_handler,
+        stream_handler,
+        respect_handler_level=True,
+    )
+    listener.start()
+    # 退出时把队列里剩下的日志写完
+    atexit.register(listener.stop)
+
     logging.basicConfig(
         level=level,
-        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+        handlers=[logging.handlers.QueueHandler(log_queue)],
     )
+    return listener
@@ -0,0 +1,193 @@
+"""GDI 区域截屏（Windows）。
+
+用 BitBlt 把屏幕上固定的一块区域拷进预分配的 DIB section，直接拿到 BGRA 像素：
+- 不经过 QScreen.grabWindow 的 QPixmap -> QImage 转换和 DPI 缩放
+- DC / DIB 只在创建时分配一次，之后每次抓取都写进同一块内存
+
+坐标是物理像素（虚拟屏幕坐标，主屏左上角为 0,0）。Qt6 默认开启 Per-Monitor DPI 感知，
+所以这里的 BitBlt 坐标与 skill_area 配置的物理像素坐标一致。
+"""
+
+import ctypes
+import logging
+from ctypes import wintypes
+from typing import Optional
+
+import numpy as np  # type: ignore
+
+
+# Win32 constants
+SRCCOPY = 0x00CC0020
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+    ]
+
+
+class BITMAPINFO(ctypes.Structure):
+    _fields_ = [
+        ("bmiHeader", BITMAPINFOHEADER),
+        ("bmiColors", wintypes.DWORD * 3),
+    ]
+
+
+_user32 = ctypes.windll.user32
+_gdi32 = ctypes.windll.gdi32
+
+# 句柄在 64 位下是指针宽度，必须声明 argtypes/restype，否则会被 ctypes 截成 32 位 int
+_user32.GetDC.argtypes = [wintypes.HWND]
+_user32.GetDC.restype = wintypes.HDC
+_user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+_user32.ReleaseDC.restype = ctypes.c_int
+_gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+_gdi32.CreateCompatibleDC.restype = wintypes.HDC
+_gdi32.CreateDIBSection.argtypes = [
+    wintypes.HDC,
+    ctypes.POINTER(BITMAPINFO),
+    wintypes.UINT,
+    ctypes.POINTER(ctypes.c_void_p),
+    wintypes.HANDLE,
+    wintypes.DWORD,
+]
+_gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+_gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+_gdi32.SelectObject.restype = wintypes.HGDIOBJ
+_gdi32.BitBlt.argtypes = [
+    wintypes.HDC,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_int,
+    wintypes.HDC,
+    ctypes.c_int,
+    ctypes.c_int,
+    wintypes.DWORD,
+]
+_gdi32.BitBlt.restype = wintypes.BOOL
+_gdi32.GdiFlush.argtypes = []
+_gdi32.GdiFlush.restype = wintypes.BOOL
+_gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+_gdi32.DeleteObject.restype = wintypes.BOOL
+_gdi32.DeleteDC.argtypes = [wintypes.HDC]
+_gdi32.DeleteDC.restype = wintypes.BOOL
+
+
+class GdiRegionGrabber:
+    """把屏幕上 (x, y, width, height) 这块区域抓进预分配的 32 位 DIB section。
+
+    用法：
+    - grab() 返回 (height, width, 4) 的 BGRA uint8 数组，它就是 DIB 的内存：下一次 grab 会覆盖，
+      要保留请自行拷贝
+    - 用完调用 close() 释放 DC / DIB（只能在创建它的线程里用）
+    """
+
+    def __init__(self, x: int, y: int, width: int, height: int) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError(f"截屏区域无效：({x},{y},{width},{height})")
+
+        self.x = int(x)
+        self.y = int(y)
+        self.width = int(width)
+        self.height = int(height)
+
+        self._screen_dc = None
+        self._mem_dc = None
+        self._dib = None
+        self._old_obj = None
+        self._pixels: Optional[np.ndarray] = None
+
+        try:
+            self._screen_dc = _user32.GetDC(None)
+            if not self._screen_dc:
+                raise OSError("GetDC 失败")
+
+            self._mem_dc = _gdi32.CreateCompatibleDC(self._screen_dc)
+            if not self._mem_dc:
+                raise OSError("CreateCompatibleDC 失败")
+
+            bmi = BITMAPINFO()
+            bmi.bmiHeader.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+            bmi.bmiHeader.biWidth = self.width
+            # 高度取负：自上而下的 DIB，第 0 行就是图像最上面一行
+            bmi.bmiHeader.biHeight = -self.height
+            bmi.bmiHeader.biPlanes = 1
+            bmi.bmiHeader.biBitCount = 32
+            bmi.bmiHeader.biCompression = BI_RGB
+
+            bits = ctypes.c_void_p()
+            self._dib = _gdi32.CreateDIBSection(
+                self._screen_dc,
+                ctypes.byref(bmi),
+                DIB_RGB_COLORS,
+                ctypes.byref(bits),
+                None,
+                0,
+            )
+            if not self._dib or not bits.value:
+                raise OSError("CreateDIBSection 失败")
+
+            self._old_obj = _gdi32.SelectObject(self._mem_dc, self._dib)
+
+            # 32 位 DIB 每行天然 4 字节对齐，没有行尾填充
+            size = self.width * self.height * 4
+            buf = (ctypes.c_ubyte * size).from_address(bits.value)
+            self._pixels = np.ctypeslib.as_array(buf).reshape((self.height, self.width, 4))
+        except Exception:
+            self.close()
+            raise
+
+    def grab(self) -> Optional[np.ndarray]:
+        """抓一次；失败返回 None。"""
+
+        if self._pixels is None:
+            return None
+
+        ok = _gdi32.BitBlt(
+            self._mem_dc,
+            0,
+            0,
+            self.width,
+            self.height,
+            self._screen_dc,
+            self.x,
+            self.y,
+            SRCCOPY,
+        )
+        if not ok:
+            logging.warning("BitBlt 失败：region=(%s,%s,%s,%s)", self.x, self.y, self.width, self.height)
+            return None
+
+        # 读 DIB 内存前先把 GDI 批处理队列刷掉，保证像素已写完
+        _gdi32.GdiFlush()
+        return self._pixels
+
+    def close(self) -> None:
+        """释放 DC / DIB（可重复调用）。"""
+
+        self._pixels = None
+        if self._mem_dc and self._old_obj:
+            _gdi32.SelectObject(self._mem_dc, self._old_obj)
+        self._old_obj = None
+        if self._dib:
+            _gdi32.DeleteObject(self._dib)
+        self._dib = None
+        if self._mem_dc:
+            _gdi32.DeleteDC(self._mem_dc)
+        self._mem_dc = None
+        if self._screen_dc:
+            _user32.ReleaseDC(None, self._screen_dc)
+        self._screen_dc = None
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from DiabloClicker.helper.singleton_def import Singleton
 from PySide6.QtGui import QImage
 
@@ -10,6 +14,13 @@ class ImageShop(metaclass=Singleton):
     tmp_cut_save_path = "screen_shoot/screenshot_small.png"
     tmp_skill_save_tpl = "screen_shoot/skill_{index}.png"
 
+    # 调试图异步写盘：单线程写，最多积压 8 张，满了直接丢（调试图只求尽力而为，不能拖慢监控 tick）
+    _async_pool: Optional[ThreadPoolExecutor] = None
+    _async_pool_lock = threading.Lock()
+    _async_slots = threading.BoundedSemaphore(8)
+    # QImage.save 的 PNG quality：80 对应 zlib 压缩等级 1（最快的有压缩档）
+    _async_png_quality = 80
+
     def __init__(self):
         self.id_images = {}
         # 检查 目录是否存在，不存在则创建
@@ -47,3 +58,46 @@ class ImageShop(metaclass=Singleton):
         img_small = img.copy(x, y, w, h)
         save_path = cls.tmp_skill_save_tpl.format(index=index)
         img_small.save(save_path)
+
+    @classmethod
+    def save_skill_image_async(cls, img: QImage, index: int) -> bool:
+        """异步保存已经裁剪好的技能区域截图到 screen_shoot/skill_{index}.png。"""
+
+        return cls.save_image_async(img, cls.tmp_skill_save_tpl.format(index=index))
+
+    @classmethod
+    def save_image_async(cls, img: QImage, save_path: str) -> bool:
+        """把 img 交给后台线程保存为 PNG，立即返回。
+
+        积压已满时丢弃本次保存并返回 False。
+        img 需是调用方不再修改的 QImage（QImage 隐式共享，后台线程只读）。
+        """
+
+        if img is None or img.isNull():
+            return False
+        if not cls._async_slots.acquire(blocking=False):
+            return False
+        try:
+            cls._get_async_pool().submit(cls._save_image_and_release, img, save_path)
+        except Exception:
+            cls._async_slots.release()
+            logging.exception(f"提交异步保存失败：{save_path}")
+            return False
+        return True
+
+    @classmethod
+    def _get_async_pool(cls) -> ThreadPoolExecutor:
+        with cls._async_pool_lock:
+            if cls._async_pool is None:
+                cls._async_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image_shop_writer")
+            return cls._async_pool
+
+    @classmethod
+    def _save_image_and_release(cls, img: QImage, save_path: str) -> None:
+        try:
+            if not img.save(save_path, "PNG", cls._async_png_quality):
+                logging.warning(f"异步保存图片失败：{save_path}")
+        except Exception:
+            logging.exception(f"异步保存图片失败：{save_path}")
+        finally:
+            cls._async_slots.release()
@@ -210,6 +210,45 @@ def send_key_to_hwnd(
                 slept += step
 
 
+def send_keys_to_hwnd_batch(
+    hwnd: int,
+    hotkeys: list[str],
+    *,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> None:
+    """向指定 hwnd 一次性发送多个按键（每个按下+抬起，只发一遍）。
+
+    说明：
+    - 同一帧里要发多个键时用它：SetForegroundWindow 只调一次，然后按顺序连续投递 KEYDOWN/KEYUP
+    - 仍用 PostMessage 投递到 hwnd（不用 SendInput：SendInput 只发给前台窗口，目标窗口没抢到焦点时会发错地方）
+    - 不支持的按键跳过并记日志，不影响其它键
+    """
+
+    vks: list[tuple[str, int]] = []
+    for hotkey in hotkeys:
+        vk = hotkey_to_vk(hotkey)
+        if vk is None:
+            logging.warning(f"不支持的按键: {hotkey}")
+            continue
+        vks.append((hotkey, vk))
+    if not vks:
+        return
+
+    try:
+        win32gui.SetForegroundWindow(hwnd)
+    except Exception:
+        pass
+
+    for hotkey, vk in vks:
+        if should_stop and should_stop():
+            return
+        try:
+            win32gui.PostMessage(hwnd, win32con.WM_KEYDOWN, vk, 0)
+            win32gui.PostMessage(hwnd, win32con.WM_KEYUP, vk, 0)
+        except Exception:
+            logging.exception(f"发送按键失败：{hotkey}")
+
+
 class TimedKeySenderThread(QThread):
     """后台线程：按多条配置定时发送按键。
 
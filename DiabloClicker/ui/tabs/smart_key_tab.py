@@ -1,10 +1,11 @@
 import logging
 import json
+import math
+import sys
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
 
-import queue
 import threading
 import time
 
@@ -22,13 +23,14 @@ from PySide6.QtWidgets import (
 )
 
 from DiabloClicker.service.capture.cap_service import CapService
+from DiabloClicker.service.capture.gdi_grabber import GdiRegionGrabber
 from DiabloClicker.service.img_ctrl.image_shop import ImageShop
 from DiabloClicker.ui.ui_tab_advance_image import Ui_TabAdvanceImage
 from DiabloClicker.service.sound.timed_key_sound import TimedKeySoundPlayer
 
 import cv2
 import numpy as np  # type: ignore
-from DiabloClicker.service.key_sender.timed_key_sender import send_key_to_hwnd
+from DiabloClicker.service.key_sender.timed_key_sender import send_key_to_hwnd, send_keys_to_hwnd_batch
 
 
 @dataclass(frozen=True)
@@ -56,6 +58,367 @@ class _SkillIcon:
     index: int
     name: str
     icon_path: Path
+    # strict 监控模式下：饱和度判定“可用”后，是否还要用模板匹配二次确认
+    require_template_match: bool = False
+
+
+@dataclass(frozen=True)
+class _RawTile:
+    """UI 线程交给 worker 的一张技能小图：每像素 4 字节的原始像素（不含 Qt 对象）。
+
+    data 是本帧 tile 批量缓冲区里的一段连续视图（见 _pack_skill_tiles_from_image），worker 只读。
+    """
+
+    data: np.ndarray
+    width: int
+    height: int
+    bytes_per_line: int
+    # True：内存字节序是 B,G,R,A（Format_RGB32/ARGB32）；False：R,G,B,A（Format_RGBA8888）
+    bgra: bool = False
+
+
+@dataclass(frozen=True)
+class _GrabRegion:
+    """监控抓屏区域：所有技能区域的外接矩形。"""
+
+    # grabWindow 用的逻辑坐标（设备无关像素）
+    x: int
+    y: int
+    width: int
+    height: int
+    # 抓到的图左上角在整屏物理像素中的位置（裁剪时按它平移）
+    origin_x: int
+    origin_y: int
+    # 整屏物理像素尺寸（ref_screen 缩放按整屏算，而不是按抓到的局部图）
+    screen_width: int
+    screen_height: int
+    # 这块区域的物理像素尺寸（GDI 直接按物理像素抓）
+    pixel_width: int
+    pixel_height: int
+
+
+# 内存字节序本来就是 B,G,R,A 的 QImage 格式（0xAARRGGBB 按 uint32 小端存储）。
+# Windows 上 grabWindow 拿到的就是 Format_RGB32：直接去掉 alpha 即可，不用先 convertToFormat 成 RGBA8888 再换回 BGR。
+# 截屏图 alpha 恒为 255，预乘与否像素值相同。
+_BGRA_QIMAGE_FORMATS = (
+    frozenset(
+        {
+            QImage.Format.Format_RGB32,
+            QImage.Format.Format_ARGB32,
+            QImage.Format.Format_ARGB32_Premultiplied,
+        }
+    )
+    if sys.byteorder == "little"
+    else frozenset()
+)
+
+@dataclass(frozen=True)
+class _IconVector:
+    """技能图标展平后的整数向量（uint16，便于直接做乘加）与它的 L2 范数。"""
+
+    data: np.ndarray
+    norm: float
+
+
+@dataclass(frozen=True)
+class _IconMatrix:
+    """_IconVector 按 index-1 叠成的矩阵：data (_MAX_SKILLS, D) uint16，norms (_MAX_SKILLS,) float64；缺图标的行 norm 为 0。"""
+
+    data: np.ndarray
+    norms: np.ndarray
+
+
+# 技能栏固定 6 个格子：index 1..6
+_MAX_SKILLS = 6
+_SKILL_INDICES = tuple(range(1, _MAX_SKILLS + 1))
+
+# 技能图标用于匹配时统一缩放到的边长。
+# 模板原图是 128x128，技能区域截图约 115x115；实测把图标缩放到 114x114 作为 image(target)、
+# 截图裁剪图作为 template 时分数最高。
+_ICON_TARGET_SIZE = 114
+
+# 模板匹配（TM_CCORR_NORMED）得分 >= 该值视为匹配成功
+_MATCH_THRESHOLD = 0.89
+
+# smart_key 表格“扫描间隔（秒）”下拉框的常用值（每行共用同一份，不在 add_row 里重建）
+_SCAN_INTERVAL_CHOICES = ("0.05", "0.1", "0.15", "0.2", "0.25", "0.3", "0.5", "1.0")
+
+
+def _build_sat_lut() -> np.ndarray:
+    """S 查找表（展平成 65536 项）：下标 max*256 + min -> OpenCV BGR->HSV 对像素 (max, min, min) 算出的 S。
+
+    直接让 cv2.cvtColor 算一遍，而不是自己写 255 * (max - min) / max：OpenCV 用定点除法表，
+    和浮点公式四舍五入的结果有 ±1 的差别。min > max 的下标不会被查到，置 0。
+    """
+
+    mx = np.arange(256, dtype=np.uint8)[:, None]
+    mn = np.arange(256, dtype=np.uint8)[None, :]
+    pixels = np.empty((256, 256, 3), dtype=np.uint8)
+    pixels[:, :, 0] = mx
+    pixels[:, :, 1] = mn
+    pixels[:, :, 2] = mn
+    lut = cv2.cvtColor(pixels, cv2.COLOR_BGR2HSV)[:, :, 1].copy()
+    lut[mn > mx] = 0
+    return lut.ravel()
+
+
+# 8bit 像素的 S 只取决于 (max, min) 两个值：查 64KB 的表代替逐像素计算（表常驻 L1/L2）。
+# 表由 OpenCV 自己生成，和 BGR->HSV 输出的 S 通道逐值相同（config 里的 sat_target_value 就是按它标定的）。
+_SAT_LUT = _build_sat_lut()
+
+
+def _sat_from_max_min(mx: np.ndarray, mn: np.ndarray) -> np.ndarray:
+    """逐像素 S（uint8）：mx/mn 是同形状的 uint8 通道最大/最小值。"""
+
+    key = mx.astype(np.uint16)
+    key <<= 8
+    key |= mn
+    return _SAT_LUT.take(key)
+
+
+def _mean_saturation_bgr(img_bgr) -> float:
+    """计算 BGR 图的平均饱和度（与 OpenCV HSV 的 S 通道一致，0~255）。
+
+    只需要 S 的均值，所以不做完整的 BGR->HSV 转换（那会分配整张 HSV 图，还要算用不到的 H/V）：
+    每个像素按 (max, min) 查 _SAT_LUT 得到 S。
+    """
+
+    b = img_bgr[:, :, 0]
+    g = img_bgr[:, :, 1]
+    r = img_bgr[:, :, 2]
+    mx = np.maximum(np.maximum(b, g), r)
+    mn = np.minimum(np.minimum(b, g), r)
+    if mx.size == 0:
+        return 0.0
+
+    return float(_sat_from_max_min(mx, mn).mean(dtype=np.float64))
+
+
+def _rgba_buffer_to_bgr(
+    buf,
+    width: int,
+    height: int,
+    bytes_per_line: int,
+    out: Optional[np.ndarray] = None,
+    bgra: bool = False,
+) -> np.ndarray:
+    """把 RGBA8888 像素缓冲区（按 bytes_per_line 跨行）转成 OpenCV 的 BGR 数组。
+
+    out：可选的预分配缓冲区 (h, w, 3) uint8。尺寸匹配时直接写入并返回它，
+    调用方跨帧复用同一块内存，避免每帧分配；尺寸不匹配时新分配一块返回。
+    bgra：缓冲区是 B,G,R,A 字节序（见 _BGRA_QIMAGE_FORMATS）时只去掉 alpha，不反转通道。
+    """
+
+    # 注意：arr 引用的是 buf 的内存，buf 必须活到下面的 cvtColor 完成（调用方持有即可）。
+    if bytes_per_line == width * 4:
+        # 无行尾填充：直接按 (h, w, 4) 解释
+        arr = np.frombuffer(buf, dtype=np.uint8, count=height * width * 4)
+        arr = arr.reshape((height, width, 4))
+    else:
+        # QImage 每行可能按 32bit 对齐，bytesPerLine 可能 > width*4。
+        # 按 stride 解释成 (h, stride/4, 4)，再切到有效像素区域；这一步全是视图，不拷贝。
+        arr = np.frombuffer(buf, dtype=np.uint8, count=height * bytes_per_line)
+        arr = arr.reshape((height, bytes_per_line // 4, 4))[:, :width, :]
+
+    if out is None or out.shape != (height, width, 3) or out.dtype != np.uint8:
+        out = np.empty((height, width, 3), dtype=np.uint8)
+
+    # RGBA -> BGR：OpenCV 内部用 SIMD shuffle 一次完成“去 alpha + 通道反转”，
+    # 比 numpy 花式索引 arr[:, :, [2, 1, 0]] 的逐元素 gather 拷贝快，也少一次临时分配。
+    # BGRA -> BGR 同理，只是不反转通道。
+    cv2.cvtColor(arr, cv2.COLOR_BGRA2BGR if bgra else cv2.COLOR_RGBA2BGR, dst=out)
+    return out
+
+
+def _sat_gate_step(
+    tiles: list[_RawTile],
+    sat_targets: np.ndarray,
+    tolerance: float,
+    scratch: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray, list[Optional[np.ndarray]], np.ndarray]:
+    """worker 每帧的饱和度判定：K 张格子一次算完。
+
+    - 所有格子转成 BGR 后首尾相接写进同一块 (P, 3) uint8 缓冲区 scratch（P 不够时才重建，调用方跨帧复用），
+      逐像素 S 查表只算一遍，再用 np.add.reduceat 按格子求均值（与 _mean_saturation_bgr 结果一致）
+    - sat_targets 为 NaN 的行（没配置目标值）判定为不可用
+    返回 (enabled_mask, mean_sats, bgr_views, scratch)；转换失败的格子 bgr_views 为 None、mean_sat 为 NaN。
+    bgr_views 是 scratch 的视图，下一帧会被覆盖。
+    """
+
+    k = len(tiles)
+    counts = np.array([t.width * t.height for t in tiles], dtype=np.int64)
+    offsets = np.zeros(k, dtype=np.int64)
+    if k > 1:
+        np.cumsum(counts[:-1], out=offsets[1:])
+    total = int(counts.sum())
+
+    if scratch is None or scratch.shape[0] < total:
+        scratch = np.empty((total, 3), dtype=np.uint8)
+
+    views: list[Optional[np.ndarray]] = []
+    converted = np.zeros(k, dtype=bool)
+    for row, tile in enumerate(tiles):
+        off = int(offsets[row])
+        view = scratch[off:off + int(counts[row])].reshape((tile.height, tile.width, 3))
+        try:
+            _rgba_buffer_to_bgr(
+                tile.data,
+                tile.width,
+                tile.height,
+                tile.bytes_per_line,
+                out=view,
+                bgra=tile.bgra,
+            )
+        except Exception:
+            views.append(None)
+            continue
+        views.append(view)
+        converted[row] = True
+
+    mean_sats = np.full(k, np.nan, dtype=np.float32)
+    if total > 0:
+        px = scratch[:total]
+        mx = np.maximum(np.maximum(px[:, 0], px[:, 1]), px[:, 2])
+        mn = np.minimum(np.minimum(px[:, 0], px[:, 1]), px[:, 2])
+        sat = _sat_from_max_min(mx, mn)
+        sums = np.add.reduceat(sat, np.minimum(offsets, total - 1), dtype=np.uint64)
+        valid = converted & (counts > 0)
+        mean_sats[valid] = sums[valid] / counts[valid]
+
+    # NaN（没算出来/没配置目标值）参与比较结果为 False
+    with np.errstate(invalid="ignore"):
+        enabled = np.abs(mean_sats - sat_targets) < tolerance
+    return enabled, mean_sats, views, scratch
+
+
+def _clip_rects(rects: np.ndarray, img_w: int, img_h: int) -> np.ndarray:
+    """把 (N, 4) 的 [x, y, w, h] 裁到 img_w x img_h 以内（与原先逐个 max/min 的边界保护一致）。
+
+    返回 (N, 4) int64 的 [x, y, w2, h2]；完全越界的行 w2/h2 为 0。
+    """
+
+    x = np.maximum(rects[:, 0], 0)
+    y = np.maximum(rects[:, 1], 0)
+    x2 = np.minimum(x + rects[:, 2], img_w)
+    y2 = np.minimum(y + rects[:, 3], img_h)
+    return np.stack([x, y, np.maximum(x2 - x, 0), np.maximum(y2 - y, 0)], axis=1)
+
+
+def _int_dot(a: np.ndarray, b: np.ndarray, axis: Optional[int] = None):
+    """uint16 向量（元素是 0~255 的像素值）的整数点积。
+
+    单个乘积最大 255*255=65025，uint16 放得下；累加用 uint64（114*114*3 个乘积会超出 int32）。
+    比先转 float32 再乘少搬 2 倍内存，结果也是精确整数。
+    """
+
+    return np.multiply(a, b).sum(axis=axis, dtype=np.uint64)
+
+
+def _icon_vector_u16(img) -> Optional[_IconVector]:
+    """把图片展平成 uint16 向量并算好 L2 范数；全黑图（范数为 0）返回 None。"""
+
+    vec = img.astype(np.uint16).ravel()
+    norm = math.sqrt(float(_int_dot(vec, vec)))
+    if norm <= 0:
+        return None
+    return _IconVector(data=vec, norm=norm)
+
+
+def _fit_template_to_icon(templ_bgr: np.ndarray, ih: int, iw: int) -> np.ndarray:
+    """template 比 image(ih x iw) 大时按比例缩小（matchTemplate 要求 template 不大于 image），否则原样返回。"""
+
+    th, tw = templ_bgr.shape[:2]
+    if th <= ih and tw <= iw:
+        return templ_bgr
+
+    scale = min(iw / float(tw), ih / float(th))
+    if scale <= 0:
+        raise ValueError(f"模板图尺寸无效：{templ_bgr.shape}")
+    new_w = max(1, int(round(tw * scale)))
+    new_h = max(1, int(round(th * scale)))
+    return cv2.resize(templ_bgr, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+
+def _batch_match_skill_icons(icon_vecs: np.ndarray, icon_norms: np.ndarray, templs: list[np.ndarray]) -> np.ndarray:
+    """一次算出多个技能格子的匹配分数（同尺寸 TM_CCORR_NORMED，即余弦相似度）。
+
+    icon_vecs：(K, D) uint16，每行是一个技能图标展平后的像素（见 _icon_vector_u16）；icon_norms：(K,) 对应范数
+    templs：K 张截图格子（BGR），第 k 张对应 icon_vecs 第 k 行
+    返回 (K,) float32；缩放后尺寸与图标对不上的行为 NaN，调用方对这些行退回 _match_skill_icon。
+    """
+
+    k = len(templs)
+    d = icon_vecs.shape[1] if icon_vecs.ndim == 2 else 0
+    scores = np.full(k, np.nan, dtype=np.float32)
+    if k == 0 or d == 0:
+        return scores
+
+    side = _ICON_TARGET_SIZE
+    t_mat = np.zeros((k, d), dtype=np.uint16)
+    fitted = np.zeros(k, dtype=bool)
+    for row, templ in enumerate(templs):
+        t = _fit_template_to_icon(templ, side, side)
+        if t.size != d:
+            continue
+        t_mat[row] = t.ravel()
+        fitted[row] = True
+
+    # 行内点积一次算完：K 个 (D,) 整数点积合并成一次乘加，不再逐个 Python 调用
+    dots = _int_dot(t_mat, icon_vecs, axis=1).astype(np.float64)
+    denom = np.sqrt(_int_dot(t_mat, t_mat, axis=1).astype(np.float64)) * icon_norms
+    ok = fitted & (denom > 0)
+    scores[ok] = dots[ok] / denom[ok]
+    scores[fitted & ~(denom > 0)] = 0.0
+    return scores
+
+
+def _opencl_available() -> bool:
+    """OpenCV 是否能用 OpenCL（T-API / UMat）：有设备且没被关掉。"""
+
+    try:
+        return bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+    except Exception:
+        return False
+
+
+def _match_skill_icon(
+    icon_bgr: np.ndarray,
+    icon_vec: Optional[_IconVector],
+    templ_bgr: np.ndarray,
+    icon_umat: Optional["cv2.UMat"] = None,
+) -> tuple[float, tuple[int, int]]:
+    """技能图标(image/target) 与截图格子(template) 做 TM_CCORR_NORMED 匹配，返回 (max_val, max_loc)。
+
+    - template 比 image 大时按比例缩小（matchTemplate 要求 template 不大于 image）
+    - 缩放后两者同尺寸时（115 -> 114 的常见情况），结果热力图只有 1x1，
+      TM_CCORR_NORMED 退化为 dot(t, i) / (|t| * |i|)：用预先展平、算好范数的 icon_vec 做一次整数点积，
+      省掉 matchTemplate 每次对 image 重新求范数和三通道乘加
+    - 尺寸确实不同时才走 cv2.matchTemplate；给了 icon_umat（OpenCL 可用时预先上传的图标）就在 GPU 上算，
+      出错退回 CPU
+    """
+
+    ih, iw = icon_bgr.shape[:2]
+    templ_for_match = _fit_template_to_icon(templ_bgr, ih, iw)
+
+    if icon_vec is not None and templ_for_match.shape == icon_bgr.shape:
+        t = templ_for_match.astype(np.uint16).ravel()
+        t_norm = math.sqrt(float(_int_dot(t, t)))
+        if t_norm <= 0:
+            return 0.0, (0, 0)
+        return float(_int_dot(t, icon_vec.data)) / (t_norm * icon_vec.norm), (0, 0)
+
+    result = None
+    if icon_umat is not None:
+        try:
+            # 图标已常驻显存，每次只上传这一张小图
+            result = cv2.matchTemplate(icon_umat, cv2.UMat(templ_for_match), cv2.TM_CCORR_NORMED).get()
+        except Exception:
+            logging.exception("OpenCL matchTemplate 失败，改用 CPU")
+            result = None
+    if result is None:
+        result = cv2.matchTemplate(icon_bgr, templ_for_match, cv2.TM_CCORR_NORMED)
+    _min_val, max_val, _min_loc, max_loc = cv2.minMaxLoc(result)
+    return float(max_val), (int(max_loc[0]), int(max_loc[1]))
 
 
 class TabSmartKey(QWidget, Ui_TabAdvanceImage):
@@ -74,8 +437,11 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         # 记录最后一次全屏截图（用于裁剪多个区域）
         self._full_image: Optional[QImage] = None
 
-        # 记录最后一次用于展示的图片（用于窗口尺寸变化时重新缩放显示）
-        self._last_image: Optional[QImage] = None
+        # 当前展示的图片（用于窗口尺寸变化时重新缩放显示）。
+        # None 表示直接展示 _full_image：不额外持有第二份全屏大图的引用（4K 截图约 32MB）。
+        self._display_image: Optional[QImage] = None
+        # 最近一次 setPixmap 对应的 (QImage.cacheKey, 宽, 高)；相同则不重复转换/缩放
+        self._display_pixmap_key: Optional[tuple[int, int, int]] = None
 
         # small_pic_region：程序启动时读取一次并缓存。
         # 这样点击“裁剪”按钮时不会频繁读磁盘/解析 JSON。
@@ -84,8 +450,8 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         # skill_area：程序启动时读取一次并缓存。
         # 用于“截图识别”时裁剪多个技能区域。
         self._skill_areas: list[_SkillArea] = self._load_skill_areas_from_config()
-        # 裁剪后的技能区域缓存：index -> QImage
-        self._skill_area_images: dict[int, QImage] = {}
+        # 裁剪后的技能区域缓存：长度固定为 _MAX_SKILLS 的列表，第 index-1 项是技能 index 的 QImage（没有则为 None）
+        self._skill_area_images: list[Optional[QImage]] = [None] * _MAX_SKILLS
 
         # skill_key_config：index -> hotkey（用于日志展示/后续扩展）
         self._skill_key_by_index: dict[int, str] = self._load_skill_key_config_from_config()
@@ -95,8 +461,22 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             icon.index: icon for icon in self._load_skill_icons_from_config()
         }
 
+        # skill_icon 解码并缩放到 114x114 后的 BGR 图：index -> ndarray
+        # 后台线程预加载，之后每次匹配直接复用（图标文件在一次运行中不会变，不必每帧读盘/解码/缩放）
+        # _skill_icons_ready 置位前不要读这个 dict
+        self._skill_icon_bgr_114: dict[int, np.ndarray] = {}
+        # 同一批图标展平后的 uint16 向量 + 范数：index -> _IconVector（同尺寸匹配时直接整数点积）
+        self._skill_icon_vec_114: dict[int, _IconVector] = {}
+        # 同一批向量按 index-1 叠成矩阵，监控批量匹配时按行取
+        self._skill_icon_vec_matrix: Optional[_IconMatrix] = None
+        # OpenCL 可用时同一批图标上传成 UMat：index -> UMat（尺寸不同、要走 matchTemplate 时用）；不可用时为空
+        self._skill_icon_umat_114: dict[int, "cv2.UMat"] = {}
+        self._skill_icons_ready = threading.Event()
+
         # 最近一次图片匹配结果：index -> score
         self._last_match_score: dict[int, float] = {}
+        # UI 线程 QImage -> BGR 的复用缓冲区（见 _qimage_to_cv_bgr）：只在 UI 线程用，尺寸变化才重建
+        self._ui_bgr_buf: Optional[np.ndarray] = None
 
         # 保持图片比例：不要让 QLabel 自动拉伸填满（会变形）
         self.labelImageShow.setScaledContents(False)
@@ -108,12 +488,27 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         # ===== 监控相关（截图/裁剪在 UI 线程；SAT 判断+发键在后台线程） =====
         self._monitor_timer = QTimer(self)
         self._monitor_timer.timeout.connect(self._on_monitor_timer_tick)
+        # 自适应间隔：tick 耗时的指数滑动平均（秒）、配置的间隔与上下限（毫秒），监控启动时重置
+        self._monitor_tick_ema: Optional[float] = None
+        self._monitor_base_interval_ms: int = 100
+        self._monitor_min_interval_ms: int = 1
+        self._monitor_max_interval_ms: int = 1000
         self._monitor_stop_event: Optional[threading.Event] = None
         self._monitor_worker_thread: Optional[threading.Thread] = None
-        self._monitor_queue: Optional[queue.Queue] = None
+        # UI -> worker 的单槽“最新一帧”：[tiles]；投递/取走都在同一把锁里换引用，_monitor_frame_ready 置位表示槽里有帧
+        self._monitor_frame_slot: list[Optional[list[Optional[_RawTile]]]] = [None]
+        self._monitor_frame_lock = threading.Lock()
+        self._monitor_frame_ready: Optional[threading.Event] = None
+        # UI 切技能小图用的两块批量缓冲区 (P, 4) uint8，轮流写（见 _next_monitor_tile_batch）；监控启动时清空
+        self._monitor_tile_batches: list[Optional[np.ndarray]] = [None, None]
+        self._monitor_tile_batch_turn: int = 0
         self._monitor_last_enabled: dict[int, bool] = {}
         self._monitor_hwnd: Optional[int] = None
         self._monitor_hwnd_title: str = ""
+        # 监控启动时算一次技能区域外接矩形，之后每帧只抓这一块（None 表示退化为抓全屏）
+        self._monitor_grab_region: Optional[_GrabRegion] = None
+        # 按 _monitor_grab_region 预分配好的 GDI 抓屏器（只在 UI 线程用）；创建失败为 None，退回 grabWindow
+        self._monitor_gdi_grabber: Optional[GdiRegionGrabber] = None
         self._monitor_settings = self._load_smart_key_monitor_settings_from_config()
 
         # ===== 方案 B：表格快照共享缓存（UI 写入，worker 读取；不传 Qt 对象） =====
@@ -124,9 +519,6 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         # 避免 load 表格时触发 itemChanged 导致不必要的缓存刷新
         self._is_loading_smart_key_table: bool = False
 
-        # 裁剪缓存与 worker 共享，做一个锁避免竞态
-        self._skill_area_lock = threading.Lock()
-
         # ===== smart_key 表格（从 config.json smart_key.keys 回填） =====
         self._smart_key_row_defaults: dict[int, float] = {}
         self._setup_smart_key_table_ui()
@@ -135,6 +527,13 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         # 初始化一次缓存（不依赖监控是否启动；worker 只读缓存）
         self._refresh_monitor_table_cache_from_ui()
 
+        # 后台预加载技能图标（磁盘读取 + PNG 解码），UI 初始化立即返回
+        threading.Thread(
+            target=self._preload_skill_icons,
+            name="smart_key_icon_preload",
+            daemon=True,
+        ).start()
+
     def showEvent(self, event) -> None:
         super().showEvent(event)
         # 在 tab 页显示时执行的代码
@@ -308,41 +707,50 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                 "interval": 1.0,
                 "sat_target_value": None,
             }
-            for i in range(1, 7)
+            for i in _SKILL_INDICES
         ]
 
     def _load_smart_key_table_from_config_or_default(self) -> None:
         self._is_loading_smart_key_table = True
-        self.tableWidget.setRowCount(0)
         self._smart_key_row_defaults.clear()
 
         configs = self._load_smart_key_configs_from_config()
         if not configs:
             configs = self._default_smart_key_configs()
 
-        for cfg in configs:
-            monitor_type = str(cfg.get("monitor_type") or "sat_checker").strip() or "sat_checker"
-            if monitor_type not in {"sat_checker", "timer_sender"}:
-                monitor_type = "sat_checker"
-
-            # 表格里只有一个“扫描间隔时间”列：
-            # - sat_checker：使用 scan_interval_seconds
-            # - timer_sender：使用 interval（与 timed_key 的语义一致）
-            scan_or_interval = float(cfg.get("scan_interval_seconds", 0.2))
-            if monitor_type == "timer_sender":
-                scan_or_interval = float(cfg.get("interval", scan_or_interval))
-
-            self._add_smart_key_row(
-                enable_hotkey=str(cfg.get("enable_hotkey") or ""),
-                send_hotkey=str(cfg.get("hotkey") or ""),
-                enabled=bool(cfg.get("enabled", True)),
-                scan_interval_seconds=scan_or_interval,
-                description=str(cfg.get("description") or ""),
-                sat_target_value=cfg.get("sat_target_value"),
-                monitor_type=monitor_type,
-            )
+        # 批量回填：整个过程只重绘一次，也不逐行 insertRow（避免每行触发一次布局/模型刷新）
+        self.tableWidget.setUpdatesEnabled(False)
+        self.tableWidget.blockSignals(True)
+        try:
+            self.tableWidget.setRowCount(0)
+            self.tableWidget.setRowCount(len(configs))
 
-        self._is_loading_smart_key_table = False
+            for row, cfg in enumerate(configs):
+                monitor_type = str(cfg.get("monitor_type") or "sat_checker").strip() or "sat_checker"
+                if monitor_type not in {"sat_checker", "timer_sender"}:
+                    monitor_type = "sat_checker"
+
+                # 表格里只有一个“扫描间隔时间”列：
+                # - sat_checker：使用 scan_interval_seconds
+                # - timer_sender：使用 interval（与 timed_key 的语义一致）
+                scan_or_interval = float(cfg.get("scan_interval_seconds", 0.2))
+                if monitor_type == "timer_sender":
+                    scan_or_interval = float(cfg.get("interval", scan_or_interval))
+
+                self._add_smart_key_row(
+                    enable_hotkey=str(cfg.get("enable_hotkey") or ""),
+                    send_hotkey=str(cfg.get("hotkey") or ""),
+                    enabled=bool(cfg.get("enabled", True)),
+                    scan_interval_seconds=scan_or_interval,
+                    description=str(cfg.get("description") or ""),
+                    sat_target_value=cfg.get("sat_target_value"),
+                    monitor_type=monitor_type,
+                    row=row,
+                )
+        finally:
+            self.tableWidget.blockSignals(False)
+            self.tableWidget.setUpdatesEnabled(True)
+            self._is_loading_smart_key_table = False
 
     def _add_smart_key_row(
         self,
@@ -353,9 +761,12 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         description: str,
         sat_target_value: float | None,
         monitor_type: str = "sat_checker",
+        row: int | None = None,
     ) -> None:
-        row = self.tableWidget.rowCount()
-        self.tableWidget.insertRow(row)
+        # row=None：追加一行；否则写入已预分配好的行（批量回填时使用）
+        if row is None:
+            row = self.tableWidget.rowCount()
+            self.tableWidget.insertRow(row)
 
         # 0 启用热键
         enable_hotkey_item = QTableWidgetItem(enable_hotkey)
@@ -388,7 +799,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         interval_combo = QComboBox(self.tableWidget)
         interval_combo.setEditable(True)
         # 常用值；也允许手动输入
-        interval_combo.addItems(["0.05", "0.1", "0.15", "0.2", "0.25", "0.3", "0.5", "1.0"])
+        interval_combo.addItems(_SCAN_INTERVAL_CHOICES)
         interval_combo.setCurrentText(str(scan_interval_seconds))
         try:
             interval_combo.currentTextChanged.connect(self._on_smart_key_table_interval_changed)
@@ -515,7 +926,8 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
     def _update_image_view(self) -> None:
         """按当前 QLabel 可用区域，等比最大化显示最后一张截图。"""
 
-        if self._last_image is None or self._last_image.isNull():
+        image = self._display_image if self._display_image is not None else self._full_image
+        if image is None or image.isNull():
             return
 
         # 用 contentsRect 更准确（会扣掉边框/内边距），比 size() 更接近“真正可显示的区域”
@@ -523,7 +935,12 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         if target_size.width() <= 0 or target_size.height() <= 0:
             return
 
-        pixmap = QPixmap.fromImage(self._last_image)
+        # 同一张图 + 同一尺寸：label 上已经是这张缩放结果，跳过 fromImage/scaled
+        pixmap_key = (int(image.cacheKey()), target_size.width(), target_size.height())
+        if pixmap_key == self._display_pixmap_key:
+            return
+
+        pixmap = QPixmap.fromImage(image)
         if pixmap.isNull():
             return
 
@@ -534,6 +951,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             Qt.SmoothTransformation,
         )
         self.labelImageShow.setPixmap(pixmap)
+        self._display_pixmap_key = pixmap_key
 
     def _load_small_pic_region_from_config(self) -> Optional[_SmallPicRegion]:
         """从 config.json 读取 small_pic_region（仅用于启动时加载/刷新缓存）。
@@ -730,7 +1148,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         {
           "screenshot": {
             "skill_icon": [
-              {"index": 1, "name": "xxx", "icon_path": "res/icons/skill/xxx.png"},
+              {"index": 1, "name": "xxx", "icon_path": "res/icons/skill/xxx.png", "require_template_match": false},
               ...
             ]
           }
@@ -766,6 +1184,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                 idx = int(raw.get("index", 0))
                 name = str(raw.get("name") or "").strip() or f"skill_{idx}"
                 icon_path_str = str(raw.get("icon_path") or "").strip()
+                require_template_match = bool(raw.get("require_template_match", False))
             except Exception:
                 continue
 
@@ -776,11 +1195,102 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             if not icon_path.is_absolute():
                 icon_path = Path.cwd() / icon_path
 
-            icons.append(_SkillIcon(index=idx, name=name, icon_path=icon_path))
+            icons.append(
+                _SkillIcon(
+                    index=idx,
+                    name=name,
+                    icon_path=icon_path,
+                    require_template_match=require_template_match,
+                )
+            )
 
         icons.sort(key=lambda i: i.index)
         return icons
 
+    def _load_skill_icon_bgr_114(self, icon: _SkillIcon) -> Optional[np.ndarray]:
+        """读取技能图标并缩放到 114x114（BGR，内存连续）；失败返回 None。"""
+
+        # Windows 下中文路径可能导致 cv2.imread 失败，优先用 imdecode 方式读取
+        img = self._cv2_imread_unicode(icon.icon_path)
+        if img is None:
+            img = cv2.imread(str(icon.icon_path))
+        if img is None:
+            return None
+
+        img = cv2.resize(
+            img,
+            (_ICON_TARGET_SIZE, _ICON_TARGET_SIZE),
+            interpolation=cv2.INTER_AREA,
+        )
+        return np.ascontiguousarray(img)
+
+    def _preload_skill_icons(self) -> None:
+        """后台线程：把所有 skill_icon 读成 114x114 的 BGR 数组并缓存。
+
+        说明：
+        - 只用 numpy/OpenCV，不碰任何 Qt 对象
+        - 全部加载完才置位 _skill_icons_ready；读不到的图标不缓存，使用时再同步读一次
+        """
+
+        loaded: dict[int, np.ndarray] = {}
+        vecs: dict[int, _IconVector] = {}
+        umats: dict[int, "cv2.UMat"] = {}
+        use_opencl = _opencl_available()
+        try:
+            for icon in list(self._skill_icons_by_index.values()):
+                img = self._load_skill_icon_bgr_114(icon)
+                if img is None:
+                    logging.warning(f"预加载技能图标失败：index={icon.index} path={icon.icon_path}")
+                    continue
+                loaded[icon.index] = img
+                vec = _icon_vector_u16(img)
+                if vec is not None:
+                    vecs[icon.index] = vec
+                if use_opencl:
+                    try:
+                        umats[icon.index] = cv2.UMat(img)
+                    except Exception:
+                        logging.exception(f"技能图标上传 OpenCL 失败：index={icon.index}")
+        except Exception:
+            logging.exception("预加载技能图标失败")
+        finally:
+            self._skill_icon_bgr_114 = loaded
+            self._skill_icon_vec_114 = vecs
+            self._skill_icon_umat_114 = umats
+            self._skill_icon_vec_matrix = self._build_skill_icon_vec_matrix(vecs)
+            self._skill_icons_ready.set()
+
+    @staticmethod
+    def _build_skill_icon_vec_matrix(vecs: dict[int, _IconVector]) -> Optional[_IconMatrix]:
+        """把 index -> _IconVector 叠成 _IconMatrix（第 index-1 行）。"""
+
+        d = _ICON_TARGET_SIZE * _ICON_TARGET_SIZE * 3
+        mat = np.zeros((_MAX_SKILLS, d), dtype=np.uint16)
+        norms = np.zeros(_MAX_SKILLS, dtype=np.float64)
+        for idx, vec in vecs.items():
+            if 1 <= idx <= _MAX_SKILLS and vec.data.size == d:
+                mat[idx - 1] = vec.data
+                norms[idx - 1] = vec.norm
+        if not np.any(norms > 0):
+            return None
+        return _IconMatrix(data=mat, norms=norms)
+
+    def _get_skill_icon_bgr(self, icon: _SkillIcon) -> Optional[np.ndarray]:
+        """取技能图标（已缩放到 114x114）：优先用预加载缓存，未就绪/缺失时同步读取。"""
+
+        if self._skill_icons_ready.is_set():
+            img = self._skill_icon_bgr_114.get(icon.index)
+            if img is not None:
+                return img
+
+        img = self._load_skill_icon_bgr_114(icon)
+        if img is not None and self._skill_icons_ready.is_set():
+            self._skill_icon_bgr_114[icon.index] = img
+            vec = _icon_vector_u16(img)
+            if vec is not None:
+                self._skill_icon_vec_114[icon.index] = vec
+        return img
+
     def _load_smart_key_monitor_settings_from_config(self) -> dict[str, object]:
         """读取智能按键监控相关配置。
 
@@ -788,6 +1298,11 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         - screenshot.smart_key_monitor_interval: float，监控间隔（秒），默认 0.1
         - screenshot.smart_key_monitor_save_debug: bool，是否写入技能小图到 screen_shoot/skill_{i}.png，默认 True
         - screenshot.smart_key_monitor_save_fullscreen: bool，是否写入“监控抓到的全屏截图”到 screen_shoot/monitor_full_latest.png，默认 False
+        - screenshot.smart_key_monitor_mode: str，默认 "sat_only"
+            - "sat_only"：只看饱和度判定是否可用，不做模板匹配
+            - "strict"：饱和度判定可用后，对 skill_icon 里 require_template_match=true 的技能再做一次模板匹配确认
+        - screenshot.smart_key_monitor_min_interval_ms: int，自适应间隔的下限（毫秒），默认等于 smart_key_monitor_interval
+        - screenshot.smart_key_monitor_max_interval_ms: int，自适应间隔的上限（毫秒），默认 1000
 
         注意：这些字段缺失不影响运行（走默认）。
         """
@@ -796,6 +1311,9 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             "interval_seconds": 0.1,
             "save_debug": True,
             "save_fullscreen": False,
+            "match_mode": "sat_only",
+            "min_interval_ms": None,
+            "max_interval_ms": 1000,
         }
 
         config_path = Path.cwd() / "config.json"
@@ -815,6 +1333,9 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         interval_raw = screenshot.get("smart_key_monitor_interval")
         save_debug_raw = screenshot.get("smart_key_monitor_save_debug")
         save_fullscreen_raw = screenshot.get("smart_key_monitor_save_fullscreen")
+        match_mode_raw = screenshot.get("smart_key_monitor_mode")
+        min_interval_ms_raw = screenshot.get("smart_key_monitor_min_interval_ms")
+        max_interval_ms_raw = screenshot.get("smart_key_monitor_max_interval_ms")
 
         interval = defaults["interval_seconds"]
         try:
@@ -834,10 +1355,25 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         if isinstance(save_fullscreen_raw, bool):
             save_fullscreen = save_fullscreen_raw
 
+        match_mode = defaults["match_mode"]
+        if isinstance(match_mode_raw, str) and match_mode_raw.strip() in {"sat_only", "strict"}:
+            match_mode = match_mode_raw.strip()
+
+        min_interval_ms = defaults["min_interval_ms"]
+        if isinstance(min_interval_ms_raw, (int, float)) and not isinstance(min_interval_ms_raw, bool) and min_interval_ms_raw > 0:
+            min_interval_ms = int(min_interval_ms_raw)
+
+        max_interval_ms = defaults["max_interval_ms"]
+        if isinstance(max_interval_ms_raw, (int, float)) and not isinstance(max_interval_ms_raw, bool) and max_interval_ms_raw > 0:
+            max_interval_ms = int(max_interval_ms_raw)
+
         return {
             "interval_seconds": float(interval),
             "save_debug": bool(save_debug),
             "save_fullscreen": bool(save_fullscreen),
+            "match_mode": str(match_mode),
+            "min_interval_ms": min_interval_ms,
+            "max_interval_ms": max_interval_ms,
         }
 
     def _capture_full_screen_qimage(self) -> Optional[QImage]:
@@ -851,60 +1387,222 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             return None
         return img
 
-    def _cut_skill_areas_from_image(
+    def _capture_region_qimage(self, region: _GrabRegion) -> Optional[QImage]:
+        """在 UI 线程只抓 region 这一块（4K 全屏约 32MB，技能栏外接矩形通常不到 1MB）。"""
+
+        screen = QApplication.primaryScreen()
+        if screen is None:
+            return None
+        img: QImage = screen.grabWindow(0, region.x, region.y, region.width, region.height).toImage()
+        if img is None or img.isNull():
+            return None
+        return img
+
+    def _skill_areas_for_cut(self, max_count: int) -> list[_SkillArea]:
+        """前 max_count 个 skill_area 中 index 落在 1.._MAX_SKILLS 的那些。"""
+
+        return [area for area in self._skill_areas[:max_count] if 1 <= area.index <= _MAX_SKILLS]
+
+    def _scale_skill_area_rects(self, areas: list[_SkillArea], screen_w: int, screen_h: int) -> np.ndarray:
+        """把一组 skill_area 坐标按 ref_screen 缩放到实际整屏尺寸（未裁边），返回 (N, 4) int64 的 [x, y, w, h]。"""
+
+        rects = np.array([(a.x, a.y, a.width, a.height) for a in areas], dtype=np.float64).reshape(-1, 4)
+
+        ref_w = self._small_pic_region.ref_screen_width if self._small_pic_region else None
+        ref_h = self._small_pic_region.ref_screen_height if self._small_pic_region else None
+        if ref_w and ref_h:
+            scale_x = screen_w / float(ref_w)
+            scale_y = screen_h / float(ref_h)
+            rects *= np.array([scale_x, scale_y, scale_x, scale_y])
+
+        # np.rint 与 round() 一样是四舍六入五成双
+        return np.rint(rects).astype(np.int64)
+
+    def _compute_monitor_grab_region(self) -> Optional[_GrabRegion]:
+        """计算所有技能区域的外接矩形（监控启动时调用一次）。
+
+        说明：
+        - skill_area 是物理像素坐标，grabWindow 要逻辑坐标：按 devicePixelRatio 换算，向外取整
+        - 算不出来（没有屏幕/没有技能区域）返回 None，监控退化为抓全屏
+        """
+
+        screen = QApplication.primaryScreen()
+        if screen is None or not self._skill_areas:
+            return None
+
+        dpr = float(screen.devicePixelRatio()) or 1.0
+        geo = screen.geometry()
+        screen_w = int(round(geo.width() * dpr))
+        screen_h = int(round(geo.height() * dpr))
+        if screen_w <= 0 or screen_h <= 0:
+            return None
+
+        areas = self._skill_areas_for_cut(_MAX_SKILLS)
+        if not areas:
+            return None
+        rects = _clip_rects(self._scale_skill_area_rects(areas, screen_w, screen_h), screen_w, screen_h)
+        rects = rects[(rects[:, 2] > 0) & (rects[:, 3] > 0)]
+        if rects.shape[0] == 0:
+            return None
+
+        x0 = int(rects[:, 0].min())
+        y0 = int(rects[:, 1].min())
+        x1 = int((rects[:, 0] + rects[:, 2]).max())
+        y1 = int((rects[:, 1] + rects[:, 3]).max())
+
+        lx = int(math.floor(x0 / dpr))
+        ly = int(math.floor(y0 / dpr))
+        lx2 = int(math.ceil(x1 / dpr))
+        ly2 = int(math.ceil(y1 / dpr))
+        origin_x = int(round(lx * dpr))
+        origin_y = int(round(ly * dpr))
+        return _GrabRegion(
+            x=lx,
+            y=ly,
+            width=lx2 - lx,
+            height=ly2 - ly,
+            origin_x=origin_x,
+            origin_y=origin_y,
+            screen_width=screen_w,
+            screen_height=screen_h,
+            pixel_width=min(screen_w, int(round(lx2 * dpr))) - origin_x,
+            pixel_height=min(screen_h, int(round(ly2 * dpr))) - origin_y,
+        )
+
+    def _create_monitor_gdi_grabber(self, region: Optional[_GrabRegion]) -> Optional[GdiRegionGrabber]:
+        """按监控抓屏区域创建 GDI 抓屏器；区域无效或创建失败返回 None（退回 QScreen.grabWindow）。"""
+
+        self._close_monitor_gdi_grabber()
+        if region is None or region.pixel_width <= 0 or region.pixel_height <= 0:
+            return None
+        try:
+            return GdiRegionGrabber(region.origin_x, region.origin_y, region.pixel_width, region.pixel_height)
+        except Exception:
+            logging.exception("创建 GDI 抓屏器失败，改用 QScreen.grabWindow")
+            return None
+
+    def _close_monitor_gdi_grabber(self) -> None:
+        grabber = self._monitor_gdi_grabber
+        self._monitor_gdi_grabber = None
+        if grabber is not None:
+            try:
+                grabber.close()
+            except Exception:
+                logging.exception("释放 GDI 抓屏器失败")
+
+    def _next_monitor_tile_batch(self, total_pixels: int) -> np.ndarray:
+        """取本帧要写的 tile 批量缓冲区 (P, 4) uint8（两块轮流用，P 不够时才重建）。
+
+        为什么两块就够：UI 只在 worker 取走上一帧后才投递新帧；worker 单线程，
+        取走第 N 帧时一定已经处理完第 N-1 帧，所以写第 N+1 帧（复用第 N-1 帧那块）不会和 worker 读冲突。
+
+        这里不切换轮次：只有这块缓冲区里的帧真正投递出去后，_post_monitor_frame 才切到另一块。
+        切分中途抛异常或没投递成功时，下一帧继续写同一块（worker 手里的一定是另一块）。
+        """
+
+        turn = self._monitor_tile_batch_turn
+        batch = self._monitor_tile_batches[turn]
+        if batch is None or batch.shape[0] < total_pixels:
+            batch = np.empty((total_pixels, 4), dtype=np.uint8)
+            self._monitor_tile_batches[turn] = batch
+        return batch
+
+    def _pack_skill_tiles_from_image(
         self,
         full_img: QImage,
         *,
-        max_count: int = 6,
+        max_count: int = _MAX_SKILLS,
         save_debug: bool = True,
-    ) -> dict[int, QImage]:
-        """从给定全屏图中裁剪技能区域并返回 index->QImage。"""
+        region: Optional[_GrabRegion] = None,
+    ) -> list[Optional[_RawTile]]:
+        """从 QImage 截图中切出技能区域（见 _pack_skill_tiles）。"""
 
-        if full_img is None or full_img.isNull() or not self._skill_areas:
-            return {}
+        if full_img is None or full_img.isNull():
+            return [None] * _MAX_SKILLS
+
+        img4, bgra = self._qimage_as_4_channel(full_img)
+        img_h = img4.height()
+        bpl = img4.bytesPerLine()
+        # img4 是局部变量，会活到 _pack_skill_tiles 里的拷贝完成
+        src = np.frombuffer(self._qimage_const_buffer(img4), dtype=np.uint8, count=img_h * bpl)
+        src = src.reshape((img_h, bpl // 4, 4))
+        return self._pack_skill_tiles(
+            src,
+            img4.width(),
+            img_h,
+            bgra,
+            max_count=max_count,
+            save_debug=save_debug,
+            region=region,
+        )
 
-        ref_w = self._small_pic_region.ref_screen_width if self._small_pic_region else None
-        ref_h = self._small_pic_region.ref_screen_height if self._small_pic_region else None
+    def _pack_skill_tiles(
+        self,
+        src: np.ndarray,
+        img_w: int,
+        img_h: int,
+        bgra: bool,
+        *,
+        max_count: int = _MAX_SKILLS,
+        save_debug: bool = True,
+        region: Optional[_GrabRegion] = None,
+    ) -> list[Optional[_RawTile]]:
+        """从截图像素中切出技能区域，返回长度 _MAX_SKILLS 的列表（第 index-1 项为技能 index 的 _RawTile）。
+
+        - src：(img_h, >=img_w, 4) uint8，每像素 4 字节（bgra 表示字节序是 B,G,R,A，否则 R,G,B,A）
+        - 各技能区域的像素首尾相接拷进同一块预分配的批量缓冲区（每块一次 np.copyto），
+          不再为每个技能 QImage.copy + bytes() 各拷一次
+        - region 为 None 时 src 是全屏图；否则 src 是按 region 抓的局部图，坐标先按整屏缩放再平移
+        - save_debug 时才额外生成 QImage 交给后台保存
+        """
 
-        img_w = full_img.width()
-        img_h = full_img.height()
+        out: list[Optional[_RawTile]] = [None] * _MAX_SKILLS
+        if not self._skill_areas or img_w <= 0 or img_h <= 0:
+            return out
 
-        scale_x = 1.0
-        scale_y = 1.0
-        if ref_w and ref_h:
-            scale_x = img_w / float(ref_w)
-            scale_y = img_h / float(ref_h)
-
-        out: dict[int, QImage] = {}
-
-        for area in self._skill_areas[:max_count]:
-            x = area.x
-            y = area.y
-            w = area.width
-            h = area.height
-
-            if ref_w and ref_h:
-                x = int(round(x * scale_x))
-                y = int(round(y * scale_y))
-                w = int(round(w * scale_x))
-                h = int(round(h * scale_y))
-
-            x = max(0, x)
-            y = max(0, y)
-            x2 = min(img_w, x + w)
-            y2 = min(img_h, y + h)
-            w2 = max(0, x2 - x)
-            h2 = max(0, y2 - y)
+        if region is None:
+            screen_w, screen_h = img_w, img_h
+            origin_x, origin_y = 0, 0
+        else:
+            screen_w, screen_h = region.screen_width, region.screen_height
+            origin_x, origin_y = region.origin_x, region.origin_y
+
+        areas = self._skill_areas_for_cut(max_count)
+        if not areas:
+            return out
+
+        rects = self._scale_skill_area_rects(areas, screen_w, screen_h)
+        rects[:, 0] -= origin_x
+        rects[:, 1] -= origin_y
+        clipped = _clip_rects(rects, img_w, img_h)
+        valid = (clipped[:, 2] > 0) & (clipped[:, 3] > 0)
+        total_pixels = int((clipped[valid, 2] * clipped[valid, 3]).sum())
+        if total_pixels <= 0:
+            return out
+
+        qfmt = QImage.Format.Format_RGB32 if bgra else QImage.Format.Format_RGBA8888
+        batch = self._next_monitor_tile_batch(total_pixels)
+        off = 0
+        for area, (x, y, w2, h2) in zip(areas, clipped.tolist()):
             if w2 <= 0 or h2 <= 0:
                 continue
 
-            cut = full_img.copy(x, y, w2, h2)
-            if cut.isNull():
-                continue
+            n = w2 * h2
+            flat = batch[off:off + n]
+            off += n
+            np.copyto(flat.reshape((h2, w2, 4)), src[y:y + h2, x:x + w2])
+            out[area.index - 1] = _RawTile(
+                data=flat,
+                width=w2,
+                height=h2,
+                bytes_per_line=w2 * 4,
+                bgra=bgra,
+            )
 
-            out[area.index] = cut
             if save_debug:
-                ImageShop.save_skill_area(full_img, x, y, w2, h2, area.index)
+                # .copy() 让 QImage 持有自己的像素，batch 之后被复用也不影响后台保存
+                cut = QImage(flat.data, w2, h2, w2 * 4, qfmt).copy()
+                ImageShop.save_skill_image_async(cut, area.index)
 
         return out
 
@@ -930,7 +1628,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                 logging.exception("读取 timed_key.keys 失败，回退到 screenshot.skill_key_config")
 
         # fallback
-        for idx in range(1, 7):
+        for idx in _SKILL_INDICES:
             if idx not in keys:
                 hk = (self._skill_key_by_index.get(idx) or "").strip()
                 if hk:
@@ -1030,15 +1728,17 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
     def _monitor_worker_main(self) -> None:
         """后台 worker：
 
-        - sat_checker：仅处理“本次队列拿到的新截图 cuts”（不复用旧截图）
-        - timer_sender：不依赖截图；即使队列没有新 item，也会按 interval 定时发送
+        - sat_checker：仅处理“本次从帧槽取到的新截图 tiles”（不复用旧截图）
+        - timer_sender：不依赖截图；即使没有新帧，也会按 interval 定时发送
 
-        方案 B：表格快照从共享缓存读取，不再通过队列传递。
+        方案 B：表格快照从共享缓存读取，不随帧传递。
         """
 
         stop_event = self._monitor_stop_event
-        q = self._monitor_queue
-        if stop_event is None or q is None:
+        frame_ready = self._monitor_frame_ready
+        frame_slot = self._monitor_frame_slot
+        frame_lock = self._monitor_frame_lock
+        if stop_event is None or frame_ready is None:
             return
 
         # 重要：sat_target_tolerance 由你手动调整；这里不要擅自修改。
@@ -1060,20 +1760,57 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
 
         last_interval_seconds_by_index: dict[int, float] = {}
 
+        # sat_checker 节流：index -> 上一次发键时间(monotonic)。
+        # 表格里的“扫描间隔时间”（scan_interval_seconds）就是同一技能两次发键的最小间隔；
+        # 没到间隔时连灰度检测都跳过，避免监控 tick 间隔把每行的配置覆盖掉。
+        last_send_ts_by_index: dict[int, float] = {}
+
+        # worker 专用的技能小图 BGR 缓冲区（见 _sat_gate_step）：worker 存活期间每帧原地写入，
+        # 只有技能区域总像素数变大（屏幕分辨率变化）时才重建
+        tile_scratch: Optional[np.ndarray] = None
+
+        # sat_only（默认）：完全不做模板匹配；strict：只对配置了 require_template_match 的技能做二次确认
+        strict_match = str(self._monitor_settings.get("match_mode") or "sat_only") == "strict"
+
+        # sat_checker 本帧判定可用、要发的热键（按技能顺序）；一帧判定完后统一发送
+        fire_hotkeys: list[str] = []
+
+        # sat_checker 判定可用：排进本帧的发送列表；每帧的触发日志只在 DEBUG 级别打（按 hotkey 节流）。
+        # hwnd 取调用时所在帧的值
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        def send_sat_key(idx: int, hotkey: str, mean_sat: float | None) -> None:
+            now_ts = time.monotonic()
+            if debug_enabled:
+                last_ts = last_log_ts_by_hotkey.get(hotkey)
+                if last_ts is None or (now_ts - last_ts) >= log_cooldown_seconds:
+                    last_log_ts_by_hotkey[hotkey] = now_ts
+                    logging.debug("监控触发：skill=%s hotkey=%s sat=%s hwnd=%s", idx, hotkey, mean_sat, hwnd)
+            last_send_ts_by_index[idx] = now_ts
+            fire_hotkeys.append(hotkey)
+
+        # 技能可用状态只在变化（可用 <-> 不可用）时打 INFO
+        def update_enabled(idx: int, enabled_now: bool, mean_sat: float | None) -> None:
+            prev = self._monitor_last_enabled.get(idx)
+            self._monitor_last_enabled[idx] = enabled_now
+            if prev is not None and prev != enabled_now:
+                logging.info("技能状态变化：skill=%s %s -> %s sat=%s", idx, prev, enabled_now, mean_sat)
+
         while not stop_event.is_set():
             # 方案 B：表格快照从共享缓存读取
             table_snapshot = self._get_monitor_table_cache_copy()
 
-            # 队列只传截图 cuts；timeout 时仍要跑 timer_sender
-            skill_images: dict[int, QImage] | None
-            try:
-                item = q.get(timeout=0.05)
-                if item is None:
-                    # sentinel（加速退出）
+            # 槽里只放截图 tiles；等不到新帧时仍要跑 timer_sender
+            skill_images: list[Optional[_RawTile]] | None = None
+            if frame_ready.wait(timeout=0.05):
+                with frame_lock:
+                    item = frame_slot[0]
+                    frame_slot[0] = None
+                    frame_ready.clear()
+                if stop_event.is_set():
+                    # 停止时会置位 frame_ready 唤醒 worker（加速退出）
                     break
-                skill_images = item if isinstance(item, dict) else None
-            except queue.Empty:
-                skill_images = None
+                skill_images = item if isinstance(item, list) else None
 
             hwnd = self._ensure_monitor_hwnd()
             if hwnd is None:
@@ -1159,20 +1896,26 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                             )
                         except Exception:
                             logging.exception(
-                                f"发送按键失败：monitor_type=timer_sender index={idx_int} hotkey={hotkey}"
+                                "发送按键失败：monitor_type=timer_sender index=%s hotkey=%s", idx_int, hotkey
                             )
                         next_due_by_index[idx_int] = time.monotonic() + interval_seconds
 
             # ===== sat_checker：仅在收到“新截图 cuts”时才运行（不复用旧截图） =====
-            if not isinstance(skill_images, dict) or not skill_images:
+            if not isinstance(skill_images, list) or not skill_images:
                 continue
 
-            for idx in range(1, 7):
+            # 过了启用/热键/节流检查、需要做饱和度判定的技能
+            sat_indices: list[int] = []
+            sat_tiles: list[_RawTile] = []
+            sat_hotkeys: list[str] = []
+            sat_targets: list[float] = []
+
+            for idx in _SKILL_INDICES:
                 if stop_event.is_set():
                     break
 
-                img_qt = skill_images.get(idx)
-                if img_qt is None:
+                tile = skill_images[idx - 1]
+                if tile is None:
                     continue
 
                 enabled_cfg = table_snapshot.get(idx)
@@ -1193,136 +1936,301 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                 if not hotkey:
                     continue
 
-                try:
-                    bgr = self._qimage_to_cv_bgr(img_qt)
-                except Exception:
+                scan_interval_seconds = float(enabled_cfg.get("interval_seconds") or 0.0)
+                last_send_ts = last_send_ts_by_index.get(idx)
+                if (
+                    last_send_ts is not None
+                    and scan_interval_seconds > 0
+                    and (time.monotonic() - last_send_ts) < scan_interval_seconds
+                ):
                     continue
 
-                mean_sat: float | None
-                try:
-                    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-                    mean_sat = float(hsv[:, :, 1].mean())
-                except Exception:
-                    mean_sat = None
-
                 sat_target_value = enabled_cfg.get("sat_target_value")
-                enabled_now = bool(
-                    mean_sat is not None
-                    and sat_target_value is not None
-                    and abs(mean_sat - float(sat_target_value)) < sat_target_tolerance
+                sat_indices.append(idx)
+                sat_tiles.append(tile)
+                sat_hotkeys.append(hotkey)
+                sat_targets.append(float(sat_target_value) if sat_target_value is not None else math.nan)
+
+            if not sat_indices or stop_event.is_set():
+                continue
+
+            # 本帧所有待判定格子一次算完饱和度并与目标值比较
+            try:
+                enabled_mask, mean_sats, bgr_views, tile_scratch = _sat_gate_step(
+                    sat_tiles,
+                    np.asarray(sat_targets, dtype=np.float32),
+                    sat_target_tolerance,
+                    tile_scratch,
                 )
+            except Exception:
+                logging.exception("监控饱和度判定失败")
+                continue
+
+            # strict 模式下饱和度判定可用、还需模板确认的技能：(icon, bgr, hotkey, mean_sat)
+            pending_confirm: list[tuple[_SkillIcon, np.ndarray, str, float | None]] = []
+
+            for row, idx in enumerate(sat_indices):
+                bgr = bgr_views[row]
+                if bgr is None:
+                    continue
+                hotkey = sat_hotkeys[row]
+                mean_sat = None if math.isnan(float(mean_sats[row])) else float(mean_sats[row])
+                enabled_now = bool(enabled_mask[row])
+                if enabled_now and strict_match:
+                    icon = self._skill_icons_by_index.get(idx)
+                    if icon is not None and icon.require_template_match:
+                        # 先攒起来，本帧所有要确认的技能一次批量匹配
+                        pending_confirm.append((icon, bgr, hotkey, mean_sat))
+                        continue
+                update_enabled(idx, enabled_now, mean_sat)
 
                 # 你的需求：只要当前帧判定为“可用（非灰色）”，就发送按键
                 if enabled_now:
-                    now_ts = time.monotonic()
-                    last_ts = last_log_ts_by_hotkey.get(hotkey)
-                    if last_ts is None or (now_ts - last_ts) >= log_cooldown_seconds:
-                        last_log_ts_by_hotkey[hotkey] = now_ts
-                        sat_str = f"{mean_sat:.1f}" if mean_sat is not None else "None"
-                        logging.info(f"监控触发：skill={idx} hotkey={hotkey} sat={sat_str} hwnd={hwnd}")
-                    try:
+                    send_sat_key(idx, hotkey, mean_sat)
+
+            if pending_confirm and not stop_event.is_set():
+                confirmed = self._confirm_skills_by_template([(icon, bgr) for icon, bgr, _hk, _sat in pending_confirm])
+                for (icon, _bgr, hotkey, mean_sat), ok in zip(pending_confirm, confirmed):
+                    update_enabled(icon.index, ok, mean_sat)
+                    if ok:
+                        send_sat_key(icon.index, hotkey, mean_sat)
+
+            if fire_hotkeys and not stop_event.is_set():
+                try:
+                    if len(fire_hotkeys) == 1:
                         send_key_to_hwnd(
                             hwnd,
-                            hotkey,
+                            fire_hotkeys[0],
                             repeat_times=1,
                             repeat_interval_seconds=0.0,
                             should_stop=stop_event.is_set,
                         )
-                    except Exception:
-                        logging.exception(f"发送按键失败：skill={idx} hotkey={hotkey}")
-                else:
-                    # logging.info(f'监控未触发：skill={idx} hotkey={hotkey} sat={mean_sat:.1f} hwnd={hwnd}')
-                    pass
+                    else:
+                        send_keys_to_hwnd_batch(hwnd, fire_hotkeys, should_stop=stop_event.is_set)
+                except Exception:
+                    logging.exception("发送按键失败：hotkeys=%s", fire_hotkeys)
+            fire_hotkeys.clear()
+
+    def _confirm_skills_by_template(self, candidates: list[tuple[_SkillIcon, np.ndarray]]) -> list[bool]:
+        """strict 模式：用模板匹配确认技能格子确实是该技能图标（worker 线程调用，只用 numpy/OpenCV）。
+
+        预加载的图标矩阵可用时，本帧所有候选一次 _batch_match_skill_icons 算完；
+        图标不在矩阵里或格子尺寸对不上的，逐个退回 _match_skill_icon。
+        """
+
+        scores = np.full(len(candidates), np.nan, dtype=np.float32)
+        mat = self._skill_icon_vec_matrix if self._skill_icons_ready.is_set() else None
+        if mat is not None:
+            rows = [icon.index - 1 for icon, _bgr in candidates]
+            icon_norms = mat.norms[rows]
+            try:
+                batch = _batch_match_skill_icons(mat.data[rows], icon_norms, [bgr for _icon, bgr in candidates])
+                # 范数为 0 的行（图标缺失）不能信，留给逐个匹配
+                has_icon = icon_norms > 0
+                scores[has_icon] = batch[has_icon]
+            except Exception:
+                logging.exception("监控批量模板匹配失败")
+
+        out: list[bool] = []
+        for k, (icon, bgr) in enumerate(candidates):
+            score = float(scores[k])
+            if math.isnan(score):
+                icon_bgr = self._get_skill_icon_bgr(icon)
+                if icon_bgr is None:
+                    out.append(False)
+                    continue
+                try:
+                    score, _loc = _match_skill_icon(
+                        icon_bgr,
+                        self._skill_icon_vec_114.get(icon.index),
+                        bgr,
+                        self._skill_icon_umat_114.get(icon.index),
+                    )
+                except Exception:
+                    logging.exception("技能 %s：监控模板匹配失败", icon.index)
+                    out.append(False)
+                    continue
+            out.append(score >= _MATCH_THRESHOLD)
+        return out
 
     def _on_monitor_timer_tick(self) -> None:
+        """UI 线程：跑一次抓屏投递，并按耗时调整下一次 tick 的间隔。"""
+
+        t0 = time.perf_counter()
+        try:
+            self._capture_and_post_monitor_frame()
+        finally:
+            self._adapt_monitor_interval(time.perf_counter() - t0)
+
+    def _adapt_monitor_interval(self, tick_seconds: float) -> None:
+        """按 tick 耗时的滑动平均调整定时器间隔。
+
+        - 平均耗时超过间隔的 80%：间隔放大到平均耗时的 1.25 倍（不超过上限），避免 tick 追不上、越积越多
+        - 平均耗时不到间隔的 30%：恢复到配置的间隔（不低于下限）
+        """
+
+        if not self._monitor_timer.isActive():
+            return
+
+        ema = self._monitor_tick_ema
+        ema = tick_seconds if ema is None else 0.9 * ema + 0.1 * tick_seconds
+        self._monitor_tick_ema = ema
+
+        interval_ms = self._monitor_timer.interval()
+        ema_ms = ema * 1000.0
+        new_interval_ms = interval_ms
+        if ema_ms > 0.8 * interval_ms:
+            new_interval_ms = min(self._monitor_max_interval_ms, int(ema_ms * 1.25))
+        elif ema_ms < 0.3 * interval_ms:
+            new_interval_ms = self._monitor_base_interval_ms
+
+        new_interval_ms = max(self._monitor_min_interval_ms, new_interval_ms)
+        if new_interval_ms != interval_ms:
+            logging.info("监控间隔调整：%sms -> %sms（tick 平均耗时 %.1fms）", interval_ms, new_interval_ms, ema_ms)
+            self._monitor_timer.setInterval(new_interval_ms)
+
+    def _capture_and_post_monitor_frame(self) -> None:
         """UI 线程：抓屏并裁剪，把 1-6 技能小图投递到 worker。"""
 
-        if self._monitor_queue is None or self._monitor_stop_event is None:
+        frame_ready = self._monitor_frame_ready
+        if frame_ready is None or self._monitor_stop_event is None:
             return
         if self._monitor_stop_event.is_set():
             return
 
-        # 你的要求：如果队列里还有未消费的数据，直接丢弃本次截图（不等待、不清空旧数据）。
-        # 等下次 tick 再检查队列是否为空，空了再塞进去。
-        try:
-            if self._monitor_queue.qsize() > 0:
-                return
-        except Exception:
-            # 极端情况下 qsize 不可用：退化为尝试 put_nowait（若 Full 就丢弃）
-            pass
+        # 你的要求：如果槽里还有未消费的数据，直接跳过本次截图（不等待、不清空旧数据）。
+        # 等下次 tick 再检查槽是否已被取走，取走了再放新的。
+        if frame_ready.is_set():
+            return
 
         # 方案 B：UI 线程把表格内容写入共享缓存（worker 线程不可直接读 Qt 控件）
         self._refresh_monitor_table_cache_from_ui()
 
-        full_img = self._capture_full_screen_qimage()
+        # 平时只抓技能栏外接矩形；要保存全屏调试图时才抓全屏
+        save_fullscreen = bool(self._monitor_settings.get("save_fullscreen", False))
+        region = None if save_fullscreen else self._monitor_grab_region
+        save_debug = bool(self._monitor_settings.get("save_debug", True))
+
+        grabber = self._monitor_gdi_grabber
+        if region is not None and grabber is not None:
+            # GDI 直接把这块区域抓进预分配的 BGRA 缓冲区，不经过 QImage
+            pixels = grabber.grab()
+            if pixels is None:
+                return
+            try:
+                tiles = self._pack_skill_tiles(
+                    pixels,
+                    grabber.width,
+                    grabber.height,
+                    True,
+                    max_count=_MAX_SKILLS,
+                    save_debug=save_debug,
+                    region=region,
+                )
+            except Exception:
+                logging.exception("监控切分技能小图失败")
+                return
+            self._post_monitor_frame(tiles)
+            return
+
+        if region is None:
+            full_img = self._capture_full_screen_qimage()
+        else:
+            full_img = self._capture_region_qimage(region)
         if full_img is None or full_img.isNull():
             return
 
-        cuts: dict[int, QImage] = {}
-        if full_img is not None and not full_img.isNull():
-            # 更新缓存（供你调试/后续 UI 复用）
+        if region is None:
+            # 更新缓存（供你调试/后续 UI 复用）；局部图不能当全屏图用，不更新
             self._full_image = full_img
 
             # 调试：保存监控时抓到的全屏图（覆盖更新），用于确认是否截图错位
-            if bool(self._monitor_settings.get("save_fullscreen", False)):
+            if save_fullscreen:
                 try:
                     out_dir = Path.cwd() / "screen_shoot"
                     out_dir.mkdir(parents=True, exist_ok=True)
                     out_path = out_dir / "monitor_full_latest.png"
-                    full_img.save(str(out_path))
+                    ImageShop.save_image_async(full_img, str(out_path))
                 except Exception:
                     logging.exception("保存监控全屏截图失败")
 
-            save_debug = bool(self._monitor_settings.get("save_debug", True))
-            cuts = self._cut_skill_areas_from_image(full_img, max_count=6, save_debug=save_debug)
+        # 交给 worker 的只有原始像素（BGR 转换在 worker 里做，不占 UI 线程）
+        try:
+            tiles = self._pack_skill_tiles_from_image(
+                full_img,
+                max_count=_MAX_SKILLS,
+                save_debug=save_debug,
+                region=region,
+            )
+        except Exception:
+            logging.exception("监控切分技能小图失败")
+            return
+        self._post_monitor_frame(tiles)
 
-        with self._skill_area_lock:
-            self._skill_area_images = dict(cuts)
+    def _post_monitor_frame(self, tiles: list[Optional[_RawTile]]) -> None:
+        """把本帧 tiles 放进帧槽并唤醒 worker。"""
 
-        try:
-            # 方案 B：队列只传本次裁剪的 cuts（不传 table_snapshot）
-            self._monitor_queue.put_nowait(cuts)
-        except queue.Full:
-            pass
+        frame_ready = self._monitor_frame_ready
+        if frame_ready is None:
+            return
 
-    def _qimage_to_cv_bgr(self, img: QImage):
-        """把 QImage 转成 OpenCV 的 BGR numpy 数组。"""
+        # 方案 B：槽里只放本次裁剪的 tiles（不传 table_snapshot）
+        with self._monitor_frame_lock:
+            self._monitor_frame_slot[0] = tiles
+            frame_ready.set()
 
-        if img.format() != QImage.Format.Format_RGBA8888:
-            img = img.convertToFormat(QImage.Format.Format_RGBA8888)
+        # 本帧的 tiles 引用着当前这块批量缓冲区，已交给 worker：下一帧换另一块写（全空帧没用到缓冲区，不切换）
+        if any(tile is not None for tile in tiles):
+            self._monitor_tile_batch_turn = 1 - self._monitor_tile_batch_turn
 
-        width = img.width()
-        height = img.height()
-        bytes_per_line = img.bytesPerLine()
+    @staticmethod
+    def _qimage_const_buffer(img: QImage):
+        """返回 QImage 像素的只读缓冲区（长度为 sizeInBytes）。
 
-        # PySide6: QImage.bits() 通常返回 memoryview（没有 setsize）。
-        # PyQt/SIP: 可能返回支持 setsize() 的指针对象。
-        ptr = img.bits()
+        用 constBits() 而不是 bits()：bits() 在 QImage 被共享（隐式共享/COW）时会先 detach 深拷贝一份，
+        constBits() 直接返回只读缓冲区。
+        PySide6: 返回 memoryview；PyQt/SIP: 返回 voidptr，需要 setsize() 后才能当 buffer 用。
+        """
+
+        ptr = img.constBits()
         size = int(img.sizeInBytes())
         if hasattr(ptr, "setsize"):
             # 兼容 PyQt
             ptr.setsize(size)  # type: ignore[attr-defined]
+            return ptr
+        return memoryview(ptr)[:size]
 
-        # 统一拿到一个长度正确的 buffer（尽量零拷贝；必要时切片）
-        buf = ptr
-        if isinstance(buf, memoryview):
-            buf = buf[:size]
-        else:
-            try:
-                buf = memoryview(buf)[:size]
-            except TypeError:
-                # 极端情况下退化为 bytes（会拷贝，但保证可用）
-                buf = bytes(ptr)[:size]
+    @staticmethod
+    def _qimage_as_4_channel(img: QImage) -> tuple[QImage, bool]:
+        """返回 (每像素 4 字节的 QImage, 是否 BGRA 字节序)。
 
-        # QImage 每行可能按 32bit 对齐，bytesPerLine 可能 > width*4。
-        # 先按 stride 读出，再裁剪到有效像素区域。
-        arr = np.frombuffer(buf, dtype=np.uint8)
-        arr = arr.reshape((height, bytes_per_line))
-        arr = arr[:, : width * 4]
-        arr = arr.reshape((height, width, 4))
-        # RGBA -> BGR
-        bgr = arr[:, :, [2, 1, 0]].copy()
-        return bgr
+        RGB32/ARGB32（BGRA）与 RGBA8888 原样返回；其它格式才 convertToFormat 成 RGBA8888（整图拷贝一次）。
+        """
+
+        fmt = img.format()
+        if fmt in _BGRA_QIMAGE_FORMATS:
+            return img, True
+        if fmt != QImage.Format.Format_RGBA8888:
+            img = img.convertToFormat(QImage.Format.Format_RGBA8888)
+        return img, False
+
+    def _qimage_to_cv_bgr(self, img: QImage, out: Optional[np.ndarray] = None):
+        """把 QImage 转成 OpenCV 的 BGR numpy 数组（out 的含义见 _rgba_buffer_to_bgr）。
+
+        注意：传了 out 时返回值可能就是 out 本身，下次复用同一缓冲区会被覆盖；要长期保留的请自行 .copy()。
+        """
+
+        img, bgra = self._qimage_as_4_channel(img)
+
+        # img 是局部变量，会活到转换完成
+        return _rgba_buffer_to_bgr(
+            self._qimage_const_buffer(img),
+            img.width(),
+            img.height(),
+            img.bytesPerLine(),
+            out=out,
+            bgra=bgra,
+        )
 
     def _cv2_imread_unicode(self, path: Path):
         """兼容 Windows Unicode 路径的图片读取。
@@ -1367,7 +2275,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
 
         # 缓存全图（用于裁剪），并默认展示全图
         self._full_image = img
-        self._last_image = img
+        self._display_image = None
         self._update_image_view()
 
     def on_smart_pic_cut_clicked(self) -> None:
@@ -1430,18 +2338,18 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         logging.info(f"已裁剪并保存 small_pic：x={x}, y={y}, w={w2}, h={h2}")
 
         # ===== 裁剪 skill_area（前 5 个）并保存+缓存 =====
-        self._cut_and_cache_skill_areas(max_count=6)
+        self._cut_and_cache_skill_areas(max_count=_MAX_SKILLS)
 
         # ===== UI 回显 =====
         # 让用户立刻看到裁剪结果：用裁剪后的图替换当前显示
-        self._last_image = img_small
+        self._display_image = img_small
         self._update_image_view()
 
     def _cut_and_cache_skill_areas(self, max_count: int = 5) -> None:
         """从全屏截图里裁剪 skill_area 列表中的前 max_count 个区域。
 
         - 每个区域保存为：screen_shoot/skill_{index}.png
-        - 同时缓存到 self._skill_area_images[index]
+        - 同时缓存到 self._skill_area_images[index - 1]
         """
 
         if self._full_image is None or self._full_image.isNull():
@@ -1451,41 +2359,20 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             logging.warning("未配置 skill_area，跳过技能区域裁剪")
             return
 
-        # 参考分辨率（优先用 small_pic_region 的 ref）
-        ref_w = self._small_pic_region.ref_screen_width if self._small_pic_region else None
-        ref_h = self._small_pic_region.ref_screen_height if self._small_pic_region else None
-
         img_w = self._full_image.width()
         img_h = self._full_image.height()
 
-        scale_x = 1.0
-        scale_y = 1.0
-        if ref_w and ref_h:
-            scale_x = img_w / float(ref_w)
-            scale_y = img_h / float(ref_h)
-
-        self._skill_area_images.clear()
-
-        for area in self._skill_areas[:max_count]:
-            x = area.x
-            y = area.y
-            w = area.width
-            h = area.height
-
-            # 若有参考分辨率则缩放
-            if ref_w and ref_h:
-                x = int(round(x * scale_x))
-                y = int(round(y * scale_y))
-                w = int(round(w * scale_x))
-                h = int(round(h * scale_y))
-
-            # 边界保护
-            x = max(0, x)
-            y = max(0, y)
-            x2 = min(img_w, x + w)
-            y2 = min(img_h, y + h)
-            w2 = max(0, x2 - x)
-            h2 = max(0, y2 - y)
+        self._skill_area_images = [None] * _MAX_SKILLS
+
+        areas = self._skill_areas_for_cut(max_count)
+        if not areas:
+            return
+
+        # 若有参考分辨率（small_pic_region 的 ref）则整体缩放，再统一做边界保护
+        rects = self._scale_skill_area_rects(areas, img_w, img_h)
+        clipped = _clip_rects(rects, img_w, img_h)
+
+        for area, (_sx, _sy, w, h), (x, y, w2, h2) in zip(areas, rects.tolist(), clipped.tolist()):
             if w2 <= 0 or h2 <= 0:
                 logging.warning(
                     f"技能区域越界或无效：index={area.index} name={area.name} "
@@ -1498,8 +2385,8 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                 logging.warning(f"技能区域裁剪失败：index={area.index} name={area.name}")
                 continue
 
-            self._skill_area_images[area.index] = img_cut
-            ImageShop.save_skill_area(self._full_image, x, y, w2, h2, area.index)
+            self._skill_area_images[area.index - 1] = img_cut
+            ImageShop.save_skill_image_async(img_cut, area.index)
             logging.info(
                 f"已裁剪技能区域：index={area.index} name={area.name} x={x} y={y} w={w2} h={h2}"
             )
@@ -1513,10 +2400,10 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             self.statusLabel.setText("当前状态：请先截图")
             return
 
-        if not self._skill_area_images:
-            self._cut_and_cache_skill_areas(max_count=6)
+        if all(img is None for img in self._skill_area_images):
+            self._cut_and_cache_skill_areas(max_count=_MAX_SKILLS)
 
-        if not self._skill_area_images:
+        if all(img is None for img in self._skill_area_images):
             logging.warning("无法图片匹配：没有可用的技能区域截图（skill_area_images 为空）")
             self.statusLabel.setText("当前状态：没有技能截图")
             return
@@ -1530,61 +2417,57 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             self.statusLabel.setText("当前状态：缺少 opencv/numpy")
             return
 
-        threshold = 0.89
+        threshold = _MATCH_THRESHOLD
         sat_disable_threshold = 50.0
-        # 你的模板原图是 128x128，但技能区域截图约 115x115。
-        # 你测试发现：把“技能图标缩放到 114x114 作为 image(target)”，
-        # 把“截图裁剪图作为 template（必要时再缩小一点点）”时分数更高。
-        icon_target_size = 114
         ok_count = 0
         total = 0
         self._last_match_score.clear()
 
-        for idx in sorted(self._skill_area_images.keys()):
+        for idx in _SKILL_INDICES:
+            img_qt = self._skill_area_images[idx - 1]
+            if img_qt is None:
+                continue
             total += 1
-            img_qt = self._skill_area_images[idx]
             icon = self._skill_icons_by_index.get(idx)
             hotkey = self._skill_key_by_index.get(idx, "")
 
             if icon is None:
-                logging.warning(f"技能 {idx} 没有配置 skill_icon，跳过匹配")
+                logging.warning("技能 %s 没有配置 skill_icon，跳过匹配", idx)
                 continue
 
             templ_path = str(icon.icon_path)
             if not icon.icon_path.exists():
-                logging.warning(f"技能 {idx} 模板图不存在：{templ_path}")
+                logging.warning("技能 %s 模板图不存在：%s", idx, templ_path)
                 continue
 
             try:
-                target_bgr = self._qimage_to_cv_bgr(img_qt)
+                # 结果只在本轮循环里用：复用 UI 线程的 BGR 缓冲区，不每个技能都分配一次
+                target_bgr = self._qimage_to_cv_bgr(img_qt, out=self._ui_bgr_buf)
+                self._ui_bgr_buf = target_bgr
             except Exception:
-                logging.exception(f"技能 {idx}：QImage 转 OpenCV 失败")
+                logging.exception("技能 %s：QImage 转 OpenCV 失败", idx)
                 continue
 
             # 先判断“灰色（禁用）态”：sat 低于阈值则直接判定禁用，不做任何匹配
             mean_sat: float | None = None
             try:
-                hsv = cv2.cvtColor(target_bgr, cv2.COLOR_BGR2HSV)
-                mean_sat = float(hsv[:, :, 1].mean())
+                mean_sat = _mean_saturation_bgr(target_bgr)
             except Exception:
                 mean_sat = None
 
             if mean_sat is not None and mean_sat < sat_disable_threshold:
-                hk = f" key={hotkey}" if hotkey else ""
                 logging.info(
-                    f"技能状态：index={idx} name={icon.name}{hk} 灰色（禁用） sat={mean_sat:.1f}"
+                    "技能状态：index=%s name=%s key=%s 灰色（禁用） sat=%.1f", idx, icon.name, hotkey, mean_sat
                 )
                 continue
 
-            # Windows 下中文路径可能导致 cv2.imread 失败，优先用 imdecode 方式读取
-            icon_bgr = self._cv2_imread_unicode(icon.icon_path)
-            logging.info(
-                f'技能 {idx}：技能图标路径={templ_path}，尺寸={icon_bgr.shape if icon_bgr is not None else "None"}'
+            # 技能图标（已缩放到 114x114）：启动时后台预加载，这里直接取缓存
+            icon_bgr = self._get_skill_icon_bgr(icon)
+            logging.debug(
+                "技能 %s：技能图标路径=%s，尺寸=%s", idx, templ_path, icon_bgr.shape if icon_bgr is not None else None
             )
             if icon_bgr is None:
-                icon_bgr = cv2.imread(templ_path)
-            if icon_bgr is None:
-                logging.warning(f"技能 {idx}：读取技能图标失败：{templ_path}")
+                logging.warning("技能 %s：读取技能图标失败：%s", idx, templ_path)
                 continue
 
             # ===== 下面开始做“模板匹配” =====
@@ -1595,47 +2478,23 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             # - 把“技能图标（缩放到 114x114）”作为 matchTemplate 的 image(target)
             # - 把“截图裁剪出来的技能格子”作为 matchTemplate 的 template
             # 这样你实测 max_val 能更高。
-            target_for_match = icon_bgr
-            templ_for_match = target_bgr
             try:
-                # 先把技能图标（原 128x128）统一缩放到 114x114，便于 1:1 匹配
-                target_for_match = cv2.resize(
-                    target_for_match,
-                    (icon_target_size, icon_target_size),
-                    interpolation=cv2.INTER_AREA,
-                )
-
-                th, tw = templ_for_match.shape[:2]
-                ih, iw = target_for_match.shape[:2]
-
-                # matchTemplate 要求：template 尺寸不能大于 image
-                if th > ih or tw > iw:
-                    scale = min(iw / float(tw), ih / float(th))
-                    if scale <= 0:
-                        logging.warning(f"技能 {idx}：模板图尺寸无效，跳过")
-                        continue
-                    new_w = max(1, int(round(tw * scale)))
-                    new_h = max(1, int(round(th * scale)))
-                    templ_for_match = cv2.resize(
-                        templ_for_match,
-                        (new_w, new_h),
-                        interpolation=cv2.INTER_AREA,
-                    )
-
-                # 开始做模板匹配，result 是相似度热力图；取 max_val 作为本次匹配得分
-                result = cv2.matchTemplate(
-                    target_for_match,
-                    templ_for_match,
-                    cv2.TM_CCORR_NORMED,
+                max_val, max_loc = _match_skill_icon(
+                    icon_bgr,
+                    self._skill_icon_vec_114.get(idx),
+                    target_bgr,
+                    self._skill_icon_umat_114.get(idx),
                 )
-                _min_val, max_val, _min_loc, max_loc = cv2.minMaxLoc(result)
-                logging.info(
-                    f'技能 {idx}：模板匹配 max_val={max_val} max_loc={max_loc}， '
-                    f'min_val={_min_val}, min_loc={_min_loc} '
-                    f'| icon(target)={target_for_match.shape} screenshot(template)={templ_for_match.shape} result={result.shape}'
+                logging.debug(
+                    "技能 %s：模板匹配 max_val=%s max_loc=%s | icon(target)=%s screenshot(template)=%s",
+                    idx,
+                    max_val,
+                    max_loc,
+                    icon_bgr.shape,
+                    target_bgr.shape,
                 )
             except Exception:
-                logging.exception(f"技能 {idx}：彩色 matchTemplate 失败")
+                logging.exception("技能 %s：彩色 matchTemplate 失败", idx)
                 continue
 
             score = float(max_val)
@@ -1644,11 +2503,15 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             if passed:
                 ok_count += 1
 
-            name = icon.name
-            hk = f" key={hotkey}" if hotkey else ""
-            sat_str = f" sat={mean_sat:.1f}" if mean_sat is not None else ""
             logging.info(
-                f"技能匹配：index={idx} name={name}{hk} score={score:.4f} passed={passed} loc={max_loc}{sat_str}"
+                "技能匹配：index=%s name=%s key=%s score=%.4f passed=%s loc=%s sat=%s",
+                idx,
+                icon.name,
+                hotkey,
+                score,
+                passed,
+                max_loc,
+                mean_sat,
             )
 
         self.statusLabel.setText(f"当前状态：匹配 {ok_count}/{total} (阈值={threshold})")
@@ -1713,8 +2576,7 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
         # 计算目标图饱和度均值（用于你分析“灰色/彩色”的状态）
         mean_sat: float | None
         try:
-            hsv = cv2.cvtColor(target_bgr, cv2.COLOR_BGR2HSV)
-            mean_sat = float(hsv[:, :, 1].mean())
+            mean_sat = _mean_saturation_bgr(target_bgr)
         except Exception:
             mean_sat = None
 
@@ -1786,10 +2648,20 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
                 return
 
             self._monitor_stop_event = threading.Event()
-            self._monitor_queue = queue.Queue(maxsize=1)
+            with self._monitor_frame_lock:
+                self._monitor_frame_slot[0] = None
+            self._monitor_frame_ready = threading.Event()
+            self._monitor_tile_batches = [None, None]
+            self._monitor_tile_batch_turn = 0
             self._monitor_last_enabled = {}
             self._monitor_hwnd = None
             self._monitor_hwnd_title = ""
+            self._monitor_grab_region = self._compute_monitor_grab_region()
+            if self._monitor_grab_region is None:
+                logging.info("监控抓屏区域：全屏")
+            else:
+                logging.info("监控抓屏区域：%s", self._monitor_grab_region)
+            self._monitor_gdi_grabber = self._create_monitor_gdi_grabber(self._monitor_grab_region)
 
             # 启动前先刷新一次共享缓存，避免 worker 刚启动时拿到空表
             self._refresh_monitor_table_cache_from_ui()
@@ -1801,7 +2673,19 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             )
             self._monitor_worker_thread.start()
 
-            self._monitor_timer.setInterval(interval_ms)
+            min_interval_ms = self._monitor_settings.get("min_interval_ms")
+            self._monitor_min_interval_ms = max(1, int(min_interval_ms) if min_interval_ms else interval_ms)
+            self._monitor_max_interval_ms = max(
+                self._monitor_min_interval_ms,
+                int(self._monitor_settings.get("max_interval_ms") or 1000),
+            )
+            self._monitor_base_interval_ms = min(
+                self._monitor_max_interval_ms,
+                max(interval_ms, self._monitor_min_interval_ms),
+            )
+            self._monitor_tick_ema = None
+
+            self._monitor_timer.setInterval(self._monitor_base_interval_ms)
             self._monitor_timer.start()
 
             self.statusLabel.setText(f"当前状态：监控已启动（{interval_seconds:.3f}s）")
@@ -1820,17 +2704,18 @@ class TabSmartKey(QWidget, Ui_TabAdvanceImage):
             if self._monitor_stop_event is not None:
                 self._monitor_stop_event.set()
 
-            if self._monitor_queue is not None:
-                try:
-                    self._monitor_queue.put_nowait(None)
-                except Exception:
-                    pass
+            if self._monitor_frame_ready is not None:
+                # 唤醒正在等帧的 worker（加速退出）
+                self._monitor_frame_ready.set()
 
             if self._monitor_worker_thread is not None:
                 self._monitor_worker_thread.join(timeout=1.0)
 
             self._monitor_worker_thread = None
-            self._monitor_queue = None
+            self._monitor_frame_ready = None
+            self._close_monitor_gdi_grabber()
+            with self._monitor_frame_lock:
+                self._monitor_frame_slot[0] = None
             self._monitor_stop_event = None
             self._monitor_hwnd = None
 
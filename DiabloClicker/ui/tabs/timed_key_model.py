@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""定时按键表格的 Model / Delegate。
+
+为什么不用 QTableWidget：
+- QTableWidget 每个格子都是一个 QTableWidgetItem，还给“间隔”“操作”列挂了常驻的 QComboBox/QWidget
+- “剩余时间”在有 hotkey 倒计时时每 100ms 刷新一次（没有倒计时就停掉刷新），逐格 setText 开销不小
+
+这里改成 QTableView + QAbstractTableModel：
+- TimedKeyModel 持有 list[KeyConfig]（唯一数据源）和并行的 next_due 列表
+- 剩余时间变化时只对那一格发 dataChanged，视图只会重新取可见行的数据
+- “间隔”用 IntervalDelegate（双击才创建 QDoubleSpinBox），“操作”列用 ResetButtonDelegate 画按钮
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from typing import Any, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QEvent, QModelIndex, QPersistentModelIndex, QRect, QSize, Qt, Signal
+from PySide6.QtWidgets import (
+    QApplication,
+    QDoubleSpinBox,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QStyleOptionViewItem,
+    QWidget,
+)
+
+from DiabloClicker.service.key_sender.timed_key_sender import KeyConfig
+
+
+# 列定义：0 热键 | 1 启用 | 2 间隔 | 3 剩余时间 | 4 操作 | 5 描述
+COL_HOTKEY = 0
+COL_ENABLED = 1
+COL_INTERVAL = 2
+COL_REMAINING = 3
+COL_ACTION = 4
+COL_DESCRIPTION = 5
+
+_HEADER_LABELS = ("热键", "启用", "间隔(秒)", "剩余时间", "操作", "描述")
+
+# next_due 为这个值表示“没在跑”，剩余时间列显示 "-"
+_NO_DUE = -1.0
+
+# 剩余时间文本表：下标是 0.1s 单位的剩余时间（0.0s ~ 60.0s）；更长的间隔再现场格式化
+_REMAINING_TEXT_CACHE = tuple(f"{i / 10:.1f}s" for i in range(601))
+
+
+def _remaining_text(ds: int) -> str:
+    if ds < len(_REMAINING_TEXT_CACHE):
+        return _REMAINING_TEXT_CACHE[ds]
+    return f"{ds / 10:.1f}s"
+
+
+class TimedKeyModel(QAbstractTableModel):
+    """定时按键表格的数据模型。"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._configs: list[KeyConfig] = []
+        # 与 _configs 一一对应：下一次触发时间点（time.monotonic() 的绝对时间）
+        self._next_due: list[float] = []
+        # 与 _configs 一一对应：当前显示的剩余时间（单位 0.1s），None 表示显示 "-"
+        self._remaining_ds: list[Optional[int]] = []
+        # 与 _remaining_ds 对应的显示文本：只在显示值变化时格式化一次，视图重绘时直接返回
+        self._remaining_text: list[str] = []
+        # hotkey -> 行号：线程回调给 UI 的是 hotkey
+        self._row_by_hotkey: dict[str, int] = {}
+
+    # ===== QAbstractTableModel 接口 =====
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._configs)
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(_HEADER_LABELS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if 0 <= section < len(_HEADER_LABELS):
+                return _HEADER_LABELS[section]
+            return None
+        return str(section + 1)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = index.row()
+        col = index.column()
+        if row < 0 or row >= len(self._configs):
+            return None
+
+        # 剩余时间列每 100ms 都会被视图重新取：直接读缓存的显示值，不走下面的分支
+        if col == COL_REMAINING:
+            if role == Qt.DisplayRole:
+                return self._remaining_text[row]
+            if role == Qt.TextAlignmentRole:
+                return int(Qt.AlignCenter)
+            return None
+
+        cfg = self._configs[row]
+
+        if role == Qt.DisplayRole:
+            if col == COL_HOTKEY:
+                return cfg.hotkey
+            if col == COL_ENABLED:
+                return "启用"
+            if col == COL_INTERVAL:
+                return f"{cfg.interval:g}"
+            if col == COL_ACTION:
+                return "重置"
+            if col == COL_DESCRIPTION:
+                return cfg.description
+            return None
+
+        if role == Qt.EditRole:
+            if col == COL_HOTKEY:
+                return cfg.hotkey
+            if col == COL_INTERVAL:
+                return float(cfg.interval)
+            if col == COL_DESCRIPTION:
+                return cfg.description
+            return None
+
+        if role == Qt.CheckStateRole and col == COL_ENABLED:
+            return Qt.Checked if cfg.enabled else Qt.Unchecked
+
+        return None
+
+    def setData(self, index: QModelIndex | QPersistentModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        row = index.row()
+        col = index.column()
+        if row < 0 or row >= len(self._configs):
+            return False
+        cfg = self._configs[row]
+
+        if role == Qt.CheckStateRole and col == COL_ENABLED:
+            new_cfg = dataclasses.replace(cfg, enabled=Qt.CheckState(value) == Qt.Checked)
+        elif role == Qt.EditRole and col == COL_HOTKEY:
+            new_cfg = dataclasses.replace(cfg, hotkey=str(value or "").strip())
+        elif role == Qt.EditRole and col == COL_INTERVAL:
+            try:
+                interval = float(value)
+            except Exception:
+                interval = 0.0
+            new_cfg = dataclasses.replace(cfg, interval=interval)
+        elif role == Qt.EditRole and col == COL_DESCRIPTION:
+            new_cfg = dataclasses.replace(cfg, description=str(value or "").strip())
+        else:
+            return False
+
+        if new_cfg == cfg:
+            return True
+        self._configs[row] = new_cfg
+        if col == COL_HOTKEY:
+            self._rename_hotkey_in_index(row, cfg.hotkey, new_cfg.hotkey)
+        self.dataChanged.emit(index, index, [role, Qt.DisplayRole])
+        return True
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        base = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        col = index.column()
+        if col == COL_ENABLED:
+            return base | Qt.ItemIsUserCheckable
+        if col in (COL_HOTKEY, COL_INTERVAL, COL_DESCRIPTION):
+            return base | Qt.ItemIsEditable
+        return base
+
+    # ===== 配置读写 =====
+
+    def configs(self) -> list[KeyConfig]:
+        """当前表格里的配置（拷贝一份列表，KeyConfig 本身不可变）。"""
+
+        return list(self._configs)
+
+    def config_at(self, row: int) -> Optional[KeyConfig]:
+        if 0 <= row < len(self._configs):
+            return self._configs[row]
+        return None
+
+    def set_configs(self, configs: list[KeyConfig]) -> None:
+        """整表替换。"""
+
+        self.beginResetModel()
+        self._configs = list(configs)
+        self._next_due = [_NO_DUE] * len(self._configs)
+        self._remaining_ds = [None] * len(self._configs)
+        self._remaining_text = ["-"] * len(self._configs)
+        self._rebuild_row_index()
+        self.endResetModel()
+
+    def append_config(self, cfg: KeyConfig) -> None:
+        """在末尾追加一行。"""
+
+        row = len(self._configs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._configs.append(cfg)
+        self._next_due.append(_NO_DUE)
+        self._remaining_ds.append(None)
+        self._remaining_text.append("-")
+        if cfg.hotkey:
+            self._row_by_hotkey[cfg.hotkey] = row
+        self.endInsertRows()
+
+    # ===== 剩余时间 =====
+
+    def set_next_due(self, hotkey: str, next_due: float) -> None:
+        """记录某个 hotkey 的下一次触发时间；显示在下一次 refresh_remaining 时更新。"""
+
+        row = self._row_by_hotkey.get(hotkey)
+        if row is not None:
+            self._next_due[row] = next_due
+
+    def refresh_remaining(self, now: Optional[float] = None) -> bool:
+        """按 next_due 重新计算剩余时间。
+
+        只更新显示值（0.1s 精度）变化的行，并且整批只发一次 dataChanged（覆盖变化行的最小范围），
+        视图合并成一次重绘。
+
+        返回：是否有任何行在倒计时（没有的话调用方可以停掉刷新定时器）。
+        """
+
+        if now is None:
+            now = time.monotonic()
+        active = False
+        first_changed = -1
+        last_changed = -1
+        for row, next_due in enumerate(self._next_due):
+            if next_due == _NO_DUE:
+                continue
+            active = True
+            ds = int(max(0.0, next_due - now) * 10)
+            if self._remaining_ds[row] == ds:
+                continue
+            self._remaining_ds[row] = ds
+            self._remaining_text[row] = _remaining_text(ds)
+            if first_changed < 0:
+                first_changed = row
+            last_changed = row
+
+        if first_changed >= 0:
+            self.dataChanged.emit(
+                self.index(first_changed, COL_REMAINING),
+                self.index(last_changed, COL_REMAINING),
+                [Qt.DisplayRole],
+            )
+        return active
+
+    def clear_remaining(self) -> None:
+        """停止后：清空 next_due，剩余时间列全部显示 "-"。"""
+
+        if not self._configs:
+            return
+        self._next_due = [_NO_DUE] * len(self._configs)
+        self._remaining_ds = [None] * len(self._configs)
+        self._remaining_text = ["-"] * len(self._configs)
+        self.dataChanged.emit(
+            self.index(0, COL_REMAINING),
+            self.index(len(self._configs) - 1, COL_REMAINING),
+            [Qt.DisplayRole],
+        )
+
+    def _rename_hotkey_in_index(self, row: int, old_hotkey: str, new_hotkey: str) -> None:
+        # 只改动这一行对应的条目，不重扫整表
+        if self._row_by_hotkey.get(old_hotkey) == row:
+            del self._row_by_hotkey[old_hotkey]
+        if new_hotkey:
+            self._row_by_hotkey[new_hotkey] = row
+
+    def _rebuild_row_index(self) -> None:
+        # hotkey 重复时后面的行覆盖前面的
+        self._row_by_hotkey.clear()
+        for row, cfg in enumerate(self._configs):
+            if cfg.hotkey:
+                self._row_by_hotkey[cfg.hotkey] = row
+
+
+class IntervalDelegate(QStyledItemDelegate):
+    """“间隔(秒)”列的编辑器：双击时才创建 QDoubleSpinBox，支持小数。"""
+
+    def createEditor(self, parent: QWidget, option: QStyleOptionViewItem, index: QModelIndex) -> QWidget:
+        editor = QDoubleSpinBox(parent)
+        editor.setDecimals(2)
+        editor.setRange(0.0, 3600.0)
+        editor.setSingleStep(1.0)
+        editor.setSuffix(" s")
+        return editor
+
+    def setEditorData(self, editor: QWidget, index: QModelIndex) -> None:
+        if isinstance(editor, QDoubleSpinBox):
+            try:
+                editor.setValue(float(index.data(Qt.EditRole) or 0.0))
+            except Exception:
+                editor.setValue(0.0)
+            return
+        super().setEditorData(editor, index)
+
+    def setModelData(self, editor: QWidget, model, index: QModelIndex) -> None:
+        if isinstance(editor, QDoubleSpinBox):
+            editor.interpretText()
+            model.setData(index, editor.value(), Qt.EditRole)
+            return
+        super().setModelData(editor, model, index)
+
+
+class ResetButtonDelegate(QStyledItemDelegate):
+    """“操作”列：直接画一个“重置”按钮，点击时发出 reset_clicked(row)，不再给每行挂一个 QPushButton。"""
+
+    reset_clicked = Signal(int)
+
+    _BUTTON_WIDTH = 80
+
+    def _button_rect(self, cell: QRect) -> QRect:
+        width = min(self._BUTTON_WIDTH, max(0, cell.width() - 4))
+        return QRect(cell.x() + 2, cell.y() + 2, width, max(0, cell.height() - 4))
+
+    def paint(self, painter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        btn = QStyleOptionButton()
+        btn.rect = self._button_rect(option.rect)
+        btn.text = str(index.data(Qt.DisplayRole) or "")
+        btn.state = QStyle.State_Enabled | QStyle.State_Raised
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, btn, painter, option.widget)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        hint = super().sizeHint(option, index)
+        return QSize(self._BUTTON_WIDTH + 4, max(hint.height(), 28))
+
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if self._button_rect(option.rect).contains(event.position().toPoint()):
+                self.reset_clicked.emit(index.row())
+                return True
+        return False
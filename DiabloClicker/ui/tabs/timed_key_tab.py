@@ -2,10 +2,9 @@ from typing import Optional
 import logging
 import time
 
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtWidgets import QWidget, QHeaderView, QTableWidgetItem, QPushButton, QHBoxLayout
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QWidget, QHeaderView, QAbstractItemView
 from DiabloClicker.ui.ui_tab_timed_key import Ui_TabTimedKey
-from PySide6.QtWidgets import QComboBox
 
 from DiabloClicker.service.key_sender.timed_key_sender import (
     KeyConfig,
@@ -20,63 +19,79 @@ from DiabloClicker.service.key_sender.timed_key_config_store import (
 
 from DiabloClicker.service.sound.timed_key_sound import TimedKeySoundPlayer
 
+from DiabloClicker.ui.tabs.timed_key_model import (
+    COL_ACTION,
+    COL_INTERVAL,
+    IntervalDelegate,
+    ResetButtonDelegate,
+    TimedKeyModel,
+)
+
 
 class TabTimedKey(QWidget, Ui_TabTimedKey):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.key_configs = []
         self.key_status: bool = False
         self._sender_thread: Optional[TimedKeySenderThread] = None
 
         # ====== 提示音（启动/停止） ======
         # 启动时从 config.json 读取并缓存：避免每次点击都读文件。
         self._sound_player = TimedKeySoundPlayer()
+        # btn_start 当前显示的文字：没变化就不 setText，避免多一次样式计算/重绘
+        self._btn_text: Optional[str] = None
+
+        # ====== 表格数据 ======
+        # 配置、next_due、当前显示的剩余时间都放在 model 里，表格只是它的视图
+        self._model = TimedKeyModel(self)
 
         # ====== “剩余时间”显示相关 ======
-        # hotkey -> 表格行号，用于快速定位某个按键对应哪一行
-        self._hotkey_to_row: dict[str, int] = {}
-        # hotkey -> 下一次触发时间点（time.monotonic() 的绝对时间）
-        self._next_due_by_hotkey: dict[str, float] = {}
-        # UI 定时器：每隔一段时间刷新一次“剩余时间”列
+        # UI 定时器：有 hotkey 在倒计时时每 100ms（显示精度）刷新一次“剩余时间”列；
+        # 没有倒计时就自己停掉，等线程推来 next_due 再启动
         self._remaining_timer = QTimer(self)
-        self._remaining_timer.setInterval(200)
+        self._remaining_timer.setInterval(100)
         self._remaining_timer.timeout.connect(self._refresh_remaining_times)
+        # 线程的 next_due_changed 可能一次来一串：先攒在这里（同一 hotkey 只留最后一次），100ms 内最多写一次 model
+        self._pending_due: dict[str, float] = {}
+        self._pending_due_timer = QTimer(self)
+        self._pending_due_timer.setSingleShot(True)
+        self._pending_due_timer.setInterval(100)
+        self._pending_due_timer.timeout.connect(self._flush_pending_due)
 
         self.setup_ui()
 
     def setup_ui(self):
         super().setupUi(self)
-        # 如果 .ui 文件还没同步列数，这里强制为 6 列：
-        # 0 热键 | 1 启用 | 2 间隔 | 3 剩余时间 | 4 操作 | 5 描述
-        self.tableWidget.setColumnCount(6)
-
-        # 显式设置表头文本，避免 .ui 没同步时显示错乱
-        self.tableWidget.setHorizontalHeaderLabels([
-            "热键",
-            "启用",
-            "间隔(秒)",
-            "剩余时间",
-            "操作",
-            "描述",
-        ])
-
-        # tableWidget 控件：这里主要做 UI 外观/列宽设置
-        self.tableWidget.setColumnWidth(0, 150)  # 热键
-        self.tableWidget.setColumnWidth(1, 100)  # 启用
-        self.tableWidget.setColumnWidth(2, 100)  # 间隔
-        self.tableWidget.setColumnWidth(3, 100)  # 剩余时间
-        self.tableWidget.setColumnWidth(4, 300)  # 操作（重置，未来更多按钮）
-        self.tableWidget.setColumnWidth(5, 300)  # 描述
+        # 0 热键 | 1 启用 | 2 间隔 | 3 剩余时间 | 4 操作 | 5 描述（表头由 model 提供）
+        self.tableView.setModel(self._model)
+
+        # 间隔：双击时才创建编辑器；操作：直接画“重置”按钮，不再每行挂控件
+        self._interval_delegate = IntervalDelegate(self.tableView)
+        self._reset_delegate = ResetButtonDelegate(self.tableView)
+        self._reset_delegate.reset_clicked.connect(self._on_reset_clicked)
+        self.tableView.setItemDelegateForColumn(COL_INTERVAL, self._interval_delegate)
+        self.tableView.setItemDelegateForColumn(COL_ACTION, self._reset_delegate)
+        self.tableView.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked | QAbstractItemView.EditKeyPressed
+        )
+
+        # tableView 控件：这里主要做 UI 外观/列宽设置
+        self.tableView.setColumnWidth(0, 150)  # 热键
+        self.tableView.setColumnWidth(1, 100)  # 启用
+        self.tableView.setColumnWidth(2, 100)  # 间隔
+        self.tableView.setColumnWidth(3, 100)  # 剩余时间
+        self.tableView.setColumnWidth(4, 300)  # 操作（重置，未来更多按钮）
+        self.tableView.setColumnWidth(5, 300)  # 描述
         # 1,2 列固定，3 列自适应宽度
-        self.tableWidget.horizontalHeader().setStretchLastSection(True)
-        self.tableWidget.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)  # 热键
-        self.tableWidget.horizontalHeader().setSectionResizeMode(1, QHeaderView.Fixed)  # 启用
-        self.tableWidget.horizontalHeader().setSectionResizeMode(2, QHeaderView.Fixed)  # 间隔
-        self.tableWidget.horizontalHeader().setSectionResizeMode(3, QHeaderView.Fixed)  # 剩余时间
-        self.tableWidget.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeToContents)  # 操作
-        self.tableWidget.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeToContents)  # 描述
+        self.tableView.horizontalHeader().setStretchLastSection(True)
+        self.tableView.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)  # 热键
+        self.tableView.horizontalHeader().setSectionResizeMode(1, QHeaderView.Fixed)  # 启用
+        self.tableView.horizontalHeader().setSectionResizeMode(2, QHeaderView.Fixed)  # 间隔
+        self.tableView.horizontalHeader().setSectionResizeMode(3, QHeaderView.Fixed)  # 剩余时间
         # 启动时：从 config.json 回填表格；若无配置则使用默认值
         self._load_table_from_config_or_default()
+        # ResizeToContents 每次数据变化都会量一遍整列，等表格填完再打开
+        self.tableView.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeToContents)  # 操作
+        self.tableView.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeToContents)  # 描述
         # 
         self.bind_events()
         self.check_btn_status()
@@ -87,25 +102,30 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
         逻辑：
         - 如果 config.json 里存在 timed_key.keys：按配置生成表格行
         - 否则：用代码内置的默认行
-        """
 
-        self.tableWidget.setRowCount(0)
-        self.key_configs.clear()
+        整表一次性 set_configs（一次 model reset），期间关掉重绘和排序，避免逐行插入时反复排版。
+        """
 
         configs = load_timed_key_configs()
-        if configs:
-            for cfg in configs:
-                self.add_row(cfg.hotkey, cfg.enabled, cfg.interval, cfg.description, cfg.toggle_reset_key)
-            return
+        if not configs:
+            # 默认行（第一次使用时没有配置，就走这里）
+            configs = [
+                KeyConfig(hotkey='1', enabled=False, interval=6.12, description='坠天星落'),
+                KeyConfig(hotkey='2', enabled=True, interval=52.0, description='正义仲裁官'),
+                KeyConfig(hotkey='3', enabled=True, interval=3.0, description='奉献'),
+                KeyConfig(hotkey='4', enabled=True, interval=4.0, description='狂信光环'),
+                KeyConfig(hotkey='5', enabled=True, interval=12.0, description='抗争光环'),
+                KeyConfig(hotkey='6', enabled=True, interval=3.0, description='庇护'),
+            ]
+
+        self.tableView.setUpdatesEnabled(False)
+        self.tableView.setSortingEnabled(False)
+        try:
+            self._model.set_configs(configs)
+        finally:
+            self.tableView.setUpdatesEnabled(True)
+
 
-        # 默认行（第一次使用时没有配置，就走这里）
-        self.add_row('1', False, 6.12,  '坠天星落')
-        self.add_row('2', True, 52,  '正义仲裁官')
-        self.add_row('3', True, 3,  '奉献')
-        self.add_row('4', True, 4,  '狂信光环')
-        self.add_row('5', True, 12,  '抗争光环')
-        self.add_row('6', True, 3,  '庇护')
-        
     def add_row(
         self,
         hotkey: str,
@@ -114,62 +134,16 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
         description: str,
         toggle_reset_key: Optional[str] = None,
     ):
-        row_position = self.tableWidget.rowCount()
-        self.tableWidget.insertRow(row_position)
-
-        # 热键 列
-        hotkey_item = QTableWidgetItem(hotkey)
-        self.tableWidget.setItem(row_position, 0, hotkey_item)
-
-        # 启用 列, checkbox
-        enabled_item = QTableWidgetItem()
-        enabled_item.setCheckState(Qt.Checked if enabled else Qt.Unchecked)
-        # 设置名称
-        enabled_item.setText("启用")
-        self.tableWidget.setItem(row_position, 1, enabled_item)
-
-        # 间隔 列, 插入 Editable ComboBox
-        interval_combo = QComboBox(self.tableWidget)
-        interval_combo.setEditable(True)
-        # 这里提供 1~60 的间隔选项（你也可以手动输入小数，比如 0.5）
-        interval_combo.addItems([str(i) for i in range(1, 61)])
-        interval_combo.setCurrentText(str(interval))
-
-        self.tableWidget.setCellWidget(row_position, 2, interval_combo)
-
-        # 剩余时间 列（启动后由 QTimer 定时刷新）
-        remaining_item = QTableWidgetItem("-")
-        remaining_item.setFlags(remaining_item.flags() & ~Qt.ItemIsEditable)
-        remaining_item.setTextAlignment(Qt.AlignCenter)
-        self.tableWidget.setItem(row_position, 3, remaining_item)
-
-        # 操作 列：用一个 layout 承载按钮，未来你可以继续往里加更多按钮
-        op_widget = QWidget(self.tableWidget)
-        op_layout = QHBoxLayout(op_widget)
-        op_layout.setContentsMargins(0, 0, 0, 0)
-        op_layout.setSpacing(8)
-
-        btn_reset = QPushButton("重置", op_widget)
-        # 用属性把 hotkey 绑在按钮上，点击时就知道要重置哪一行
-        btn_reset.setProperty("hotkey", hotkey)
-        btn_reset.clicked.connect(self._on_reset_clicked)
-        op_layout.addWidget(btn_reset)
-        op_layout.addStretch(1)
-
-        self.tableWidget.setCellWidget(row_position, 4, op_widget)
-
-        # 描述 列
-        description_item = QTableWidgetItem(description)
-        self.tableWidget.setItem(row_position, 5, description_item)
-        key_config = KeyConfig(
-            hotkey=hotkey,
-            enabled=enabled,
-            interval=float(interval),
-            description=description,
-            toggle_reset_key=toggle_reset_key,
+        self._model.append_config(
+            KeyConfig(
+                hotkey=hotkey,
+                enabled=enabled,
+                interval=float(interval),
+                description=description,
+                toggle_reset_key=toggle_reset_key,
+            )
         )
-        self.key_configs.append(key_config)
-    
+
     def bind_events(self):
         # 点击按钮：启动/停止
         self.btn_start.clicked.connect(self.on_start_clicked)
@@ -190,46 +164,10 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
     def _collect_configs_from_table(self) -> list[KeyConfig]:
         """从表格读取当前配置。
 
-        为什么要从表格读：
-        - 用户可能修改了勾选状态或间隔值
-        - 所以点击“启动”时要用最新的 UI 数据
+        表格编辑直接写进 model，所以这里拿到的就是最新的 UI 数据（含表格里不显示的 toggle_reset_key）。
         """
 
-        # 说明：表格里没有 toggle_reset_key 列，但我们需要保留配置。
-        # 所以这里从 self.key_configs 中用 hotkey 做一次映射，把 toggle_reset_key 带回去。
-        reset_key_by_hotkey: dict[str, Optional[str]] = {
-            c.hotkey: c.toggle_reset_key for c in self.key_configs
-        }
-
-        configs: list[KeyConfig] = []
-        for row in range(self.tableWidget.rowCount()):
-            hotkey_item = self.tableWidget.item(row, 0)
-            enabled_item = self.tableWidget.item(row, 1)
-            interval_widget = self.tableWidget.cellWidget(row, 2)
-            description_item = self.tableWidget.item(row, 5)
-
-            hotkey = hotkey_item.text().strip() if hotkey_item else ""
-            enabled = bool(enabled_item and enabled_item.checkState() == Qt.Checked)
-            description = description_item.text().strip() if description_item else ""
-
-            interval_text = ""
-            if isinstance(interval_widget, QComboBox):
-                interval_text = interval_widget.currentText().strip()
-            try:
-                interval = float(interval_text)
-            except Exception:
-                interval = 0.0
-
-            configs.append(
-                KeyConfig(
-                    hotkey=hotkey,
-                    enabled=enabled,
-                    interval=interval,
-                    description=description,
-                    toggle_reset_key=reset_key_by_hotkey.get(hotkey),
-                )
-            )
-        return configs
+        return self._model.configs()
 
     def trigger_reset_by_hotkey(self, hotkey: str) -> None:
         """供全局快捷键调用：等价于点击该行的“重置”按钮。
@@ -243,7 +181,7 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
 
         self._do_reset_hotkey(hotkey)
 
-    def _on_reset_clicked(self):
+    def _on_reset_clicked(self, row: int):
         """点击“重置”按钮：把该行的剩余时间强制改为 1 秒。
 
         需求解释：
@@ -253,11 +191,8 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
           => 1 秒后会触发一次按键
         """
 
-        btn = self.sender()
-        if not isinstance(btn, QPushButton):
-            return
-
-        hotkey = str(btn.property("hotkey") or "").strip()
+        cfg = self._model.config_at(row)
+        hotkey = cfg.hotkey.strip() if cfg else ""
         if not hotkey:
             return
 
@@ -270,11 +205,10 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
 
         # 1) 先更新 UI：立刻显示 1.0s
         now = time.monotonic()
-        next_due = now + 1.0
-        self._next_due_by_hotkey[hotkey] = next_due
-        row = self._hotkey_to_row.get(hotkey)
-        if row is not None:
-            self._set_remaining_text(row, 1.0)
+        # 攒着的旧 next_due 已经过时，别让它在 flush 时把 1.0s 覆盖掉
+        self._pending_due.pop(hotkey, None)
+        self._model.set_next_due(hotkey, now + 1.0)
+        self._model.refresh_remaining(now)
 
         # 2) 通知线程：把 next_due 改为 1 秒后
         self._sender_thread.request_next_due_in(hotkey, 1.0)
@@ -282,57 +216,39 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
         # 3) 提示音
         self._sound_player.play_reset()
 
-    def _rebuild_hotkey_row_index(self):
-        """重建 hotkey->row 的索引。
-
-        为什么需要：
-        - 线程回调给 UI 的是 hotkey（比如 '1'）
-        - UI 更新“剩余时间”时，需要知道 hotkey 在表格哪一行
-        """
-
-        self._hotkey_to_row.clear()
-        for row in range(self.tableWidget.rowCount()):
-            item = self.tableWidget.item(row, 0)
-            if not item:
-                continue
-            hotkey = item.text().strip()
-            if hotkey:
-                self._hotkey_to_row[hotkey] = row
-
-    def _set_remaining_text(self, row: int, remaining_seconds: float) -> None:
-        """把某行的“剩余时间”列更新为可读文本。"""
-
-        remaining_item = self.tableWidget.item(row, 3)
-        if not remaining_item:
-            remaining_item = QTableWidgetItem("-")
-            remaining_item.setFlags(remaining_item.flags() & ~Qt.ItemIsEditable)
-            remaining_item.setTextAlignment(Qt.AlignCenter)
-            self.tableWidget.setItem(row, 3, remaining_item)
-
-        if remaining_seconds < 0:
-            remaining_seconds = 0.0
-        remaining_item.setText(f"{remaining_seconds:.1f}s")
-
     def _refresh_remaining_times(self):
         """定时刷新“剩余时间”列。
 
         计算方式：
         - 线程会通过 next_due_changed 信号告诉 UI：某个 hotkey 的 next_due(单调时间)
-        - UI 每隔 200ms 计算 remaining = next_due - time.monotonic()
+        - UI 每隔 100ms 计算 remaining = next_due - time.monotonic()
+        - 没有任何 hotkey 在倒计时时停掉定时器（_flush_pending_due 会重新启动）
         """
 
-        now = time.monotonic()
-        for hotkey, next_due in list(self._next_due_by_hotkey.items()):
-            row = self._hotkey_to_row.get(hotkey)
-            if row is None:
-                continue
-            remaining = next_due - now
-            self._set_remaining_text(row, remaining)
+        # 页面/窗口不可见时不刷新（showEvent 会重新启动定时器）
+        if not self.isVisible():
+            return
+
+        if not self._model.refresh_remaining(time.monotonic()):
+            self._remaining_timer.stop()
 
     def _on_next_due_changed(self, hotkey: str, next_due: float):
-        """线程回调：某个 hotkey 的 next_due 更新。"""
+        """线程回调：某个 hotkey 的 next_due 更新（先攒起来，由 _flush_pending_due 统一写入）。"""
+
+        self._pending_due[hotkey] = next_due
+        if not self._pending_due_timer.isActive():
+            self._pending_due_timer.start()
 
-        self._next_due_by_hotkey[hotkey] = next_due
+    def _flush_pending_due(self):
+        """把攒下的 next_due 一次性写进 model。"""
+
+        pending = self._pending_due
+        self._pending_due = {}
+        for hotkey, next_due in pending.items():
+            self._model.set_next_due(hotkey, next_due)
+
+        if self.key_status and self.isVisible() and not self._remaining_timer.isActive():
+            self._remaining_timer.start()
 
     def _stop_sender_thread(self):
         """停止后台线程（如果存在）。
@@ -349,11 +265,9 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
 
         # 停止后：停止 UI 刷新，并清空剩余时间
         self._remaining_timer.stop()
-        self._next_due_by_hotkey.clear()
-        for row in range(self.tableWidget.rowCount()):
-            item = self.tableWidget.item(row, 3)
-            if item:
-                item.setText("-")
+        self._pending_due_timer.stop()
+        self._pending_due.clear()
+        self._model.clear_remaining()
 
     def stop_from_external(self) -> None:
         """供外部（例如全局热键/主窗口）强制停止。
@@ -368,7 +282,6 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
         if self.key_status:
             self.key_status = False
         try:
-            self.btn_start.setChecked(False)
             self.check_btn_status()
         except Exception:
             # 避免在 UI 未完整初始化时影响调用方
@@ -388,9 +301,6 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
             configs = self._collect_configs_from_table()
             logging.info(f"准备启动定时按键发送，目标窗口标题：{target_title}，配置：{configs}")
 
-            # 重建索引，用于后续更新“剩余时间”列
-            self._rebuild_hotkey_row_index()
-
             # 2) 启动前，先确保没有旧线程残留
             self._stop_sender_thread()
 
@@ -400,8 +310,9 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
             self._sender_thread.next_due_changed.connect(self._on_next_due_changed)
             self._sender_thread.start()
 
-            # 4) 开始定时刷新“剩余时间”列
-            self._remaining_timer.start()
+            # 4) 开始定时刷新“剩余时间”列（页面不可见时等 showEvent 再启动）
+            if self.isVisible():
+                self._remaining_timer.start()
 
             self.key_status = True
 
@@ -415,7 +326,6 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
             # 停止完成：播放“停止音效”
             self._sound_player.play_stop()
 
-        self.btn_start.setChecked(self.key_status)
         self.check_btn_status()
 
     def _on_sender_finished(self):
@@ -425,12 +335,22 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
         self._remaining_timer.stop()
         if self.key_status:
             self.key_status = False
-            self.btn_start.setChecked(False)
             self.check_btn_status()
 
         # 线程自然退出也算“关闭”
         self._sound_player.play_stop()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 切回本页时：线程在跑才恢复“剩余时间”刷新
+        if self.key_status and not self._remaining_timer.isActive():
+            self._remaining_timer.start()
+
+    def hideEvent(self, event):
+        # 切走/最小化时不再刷新“剩余时间”
+        self._remaining_timer.stop()
+        super().hideEvent(event)
+
     def closeEvent(self, event):
         # 窗口关闭时，确保线程退出，避免进程残留
         self._stop_sender_thread()
@@ -438,7 +358,12 @@ class TabTimedKey(QWidget, Ui_TabTimedKey):
         
             
     def check_btn_status(self):
-        if not self.key_status:
-            self.btn_start.setText("已停止")
-        else:
-            self.btn_start.setText("启动中")
\ No newline at end of file
+        """按 key_status 同步 btn_start 的勾选状态和文字（只在有变化时才调用 Qt）。"""
+
+        if self.btn_start.isChecked() != self.key_status:
+            self.btn_start.setChecked(self.key_status)
+
+        text = "启动中" if self.key_status else "已停止"
+        if text != self._btn_text:
+            self._btn_text = text
+            self.btn_start.setText(text)
\ No newline at end of file
@@ -1,12 +1,19 @@
 """AVIF -> PNG batch converter.
 
 Usage:
-  python tools/avif_to_png.py <path> [--out <out_dir>] [--recursive] [--overwrite]
+  python tools/avif_to_png.py <path> [--out <out_dir>] [--recursive] [--overwrite] [--png-level N]
 
 - <path> can be a file or a directory.
 - If a directory is provided, this scans for AVIF by:
     1) file extension .avif (case-insensitive), OR
-    2) ISO-BMFF header brand 'avif' (so files mislabeled as .png will also be detected)
+    2) ISO-BMFF header brand 'avif' for files with another image extension
+       (.png/.jpg/.jpeg/.webp), so files mislabeled as .png will also be detected.
+       A single file given directly is always header-checked.
+
+Notes about --png-level:
+- zlib level used for the PNG output (0-9, default 1). Deflate dominates the encode
+  cost; level 1 is several times faster than Pillow's default 6 and the files are
+  only slightly larger. Use 9 when output size matters more than speed.
 
 Notes about "PNG looks more gray":
 - Many "looks gray" issues come from missing/ignored ICC color profiles.
@@ -23,11 +30,96 @@ Install (recommended):
 from __future__ import annotations
 
 import argparse
+import hashlib
+import io
+import os
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
+# Imported once at module load instead of per file. Missing dependencies are
+# reported per file by _convert_one so the scan itself still works without them.
+try:
+    from PIL import Image  # type: ignore
+
+    _PIL_OK = True
+except Exception:
+    _PIL_OK = False
+
+try:
+    # Optional: Pillow builds without littleCMS lack ImageCms; then ICC conversion is skipped
+    from PIL import ImageCms  # type: ignore
+
+    _CMS_OK = True
+except Exception:
+    _CMS_OK = False
+
+try:
+    # Ensure AVIF plugin is registered (import side-effect)
+    import pillow_avif  # type: ignore  # noqa: F401
+
+    _AVIF_OK = True
+except Exception:
+    _AVIF_OK = False
+
+# sRGB target profile: identical for every file, built on first use and reused.
+_SRGB_PROFILE = None
+_SRGB_PROFILE_LOCK = threading.Lock()
+
+
+def _srgb_profile():
+    global _SRGB_PROFILE
+    if _SRGB_PROFILE is None:
+        with _SRGB_PROFILE_LOCK:
+            if _SRGB_PROFILE is None:
+                _SRGB_PROFILE = ImageCms.createProfile("sRGB")
+    return _SRGB_PROFILE
+
+
+# ICC -> sRGB transforms keyed by (blake2b(icc bytes), mode). AVIFs from the same
+# camera/exporter share a profile, so the ICC parse + transform build happens once.
+_TRANSFORM_CACHE: dict[tuple[bytes, str], object] = {}
+_TRANSFORM_CACHE_MAX = 32
+_TRANSFORM_CACHE_LOCK = threading.Lock()
+# littleCMS cmsFLAGS_NOCACHE: a cached transform is applied from several worker
+# threads at once, and lcms' one-pixel cache is not thread-safe.
+_LCMS_NOCACHE = 0x0040
+
+
+def _get_srgb_transform(icc_profile: bytes, mode: str):
+    key = (hashlib.blake2b(icc_profile, digest_size=16).digest(), mode)
+    with _TRANSFORM_CACHE_LOCK:
+        transform = _TRANSFORM_CACHE.get(key)
+    if transform is not None:
+        return transform
+
+    src_prof = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+    transform = ImageCms.buildTransform(src_prof, _srgb_profile(), mode, mode, flags=_LCMS_NOCACHE)
+
+    with _TRANSFORM_CACHE_LOCK:
+        if len(_TRANSFORM_CACHE) >= _TRANSFORM_CACHE_MAX:
+            # Evict the oldest entry (dicts keep insertion order)
+            del _TRANSFORM_CACHE[next(iter(_TRANSFORM_CACHE))]
+        _TRANSFORM_CACHE[key] = transform
+    return transform
+
+
+# Extensions (lower-case, no dot) that may hide a mislabeled AVIF; only these get a
+# header sniff in a directory scan.
+_SUSPECT_EXTS = frozenset({"png", "jpg", "jpeg", "webp"})
+
+
+def _ext_of(name: str) -> str:
+    """Lower-case extension without the dot; same rules as Path.suffix ('' for '.bashrc')."""
+    head, sep, ext = name.rpartition(".")
+    if not sep or not head:
+        return ""
+    return ext.lower()
+
 
 @dataclass(frozen=True)
 class ConvertResult:
@@ -37,13 +129,24 @@ class ConvertResult:
     reason: str = ""
 
 
-def _is_probably_avif(path: Path) -> bool:
-    """Detect AVIF either by extension or by ISO-BMFF header brand."""
-    if path.suffix.lower() == ".avif":
+def _is_probably_avif(path: Path, ext: str | None = None, size: int | None = None) -> bool:
+    """Detect AVIF either by extension or by ISO-BMFF header brand.
+
+    Only the first 32 bytes are read. If the caller already knows the file size
+    (e.g. from a directory scan), files too small to hold an ftyp box are skipped
+    without opening them. ``ext`` is the precomputed _ext_of(path.name), if known.
+    """
+    if ext is None:
+        ext = _ext_of(path.name)
+    if ext == "avif":
         return True
 
+    if size is not None and size < 12:
+        return False
+
     try:
-        head = path.read_bytes()[:32]
+        with path.open("rb") as f:
+            head = f.read(32)
     except Exception:
         return False
 
@@ -55,37 +158,99 @@ def _is_probably_avif(path: Path) -> bool:
     return False
 
 
-def _iter_candidates(input_path: Path, recursive: bool) -> Iterable[Path]:
+def _iter_candidates(input_path: Path, recursive: bool) -> Iterable[tuple[Path, str, int | None]]:
+    """Yield (file, ext, size) tuples; ext is computed once here (see _ext_of).
+
+    Uses os.scandir so file/dir checks come from the cached DirEntry data instead
+    of a stat() per Path. The size is only looked up for files that will need a
+    header sniff (see _SUSPECT_EXTS); it is None otherwise.
+    """
     if input_path.is_file():
-        yield input_path
+        yield input_path, _ext_of(input_path.name), None
         return
 
     if not input_path.is_dir():
         return
 
-    if recursive:
-        yield from (p for p in input_path.rglob("*") if p.is_file())
-    else:
-        yield from (p for p in input_path.glob("*") if p.is_file())
+    pending = [str(input_path)]
+    while pending:
+        try:
+            it = os.scandir(pending.pop())
+        except OSError:
+            continue
+
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        ext = _ext_of(entry.name)
+                        if ext in _SUSPECT_EXTS:
+                            yield Path(entry.path), ext, entry.stat(follow_symlinks=False).st_size
+                        else:
+                            yield Path(entry.path), ext, None
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                except OSError:
+                    continue
 
 
 def _ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+# Process umask, read once at import (os.umask can only be queried by setting it,
+# which is not safe once worker threads are creating files). tempfile creates 0600
+# files; the output gets the same mode a plain open() would have given it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _write_atomic(dst: Path, buf: io.BytesIO) -> None:
+    """Write the encoded PNG in one write() to a temp file, then os.replace it onto dst.
+
+    A crash mid-write leaves at most a stray .tmp file, never a truncated dst.
+    The temp name is unique per call: conversions run in parallel and two sources
+    can map to the same dst, so a shared "<dst>.tmp" could publish another
+    thread's half-written file.
+    """
+    _ensure_parent_dir(dst)
+    f = tempfile.NamedTemporaryFile(
+        dir=dst.parent,
+        prefix=dst.name + ".",
+        suffix=".tmp",
+        delete=False,
+        buffering=1 << 20,
+    )
+    tmp = Path(f.name)
+    try:
+        with f:
+            f.write(buf.getbuffer())
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, dst)
+    except BaseException:
+        _unlink_quiet(tmp)
+        raise
+
+
+def _unlink_quiet(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
 def _convert_one(
     src: Path,
     dst: Path,
     *,
     overwrite: bool,
     color_manage: bool,
+    png_level: int = 1,
 ) -> ConvertResult:
     if not overwrite and dst.exists():
         return ConvertResult(src=src, dst=dst, ok=False, reason="dst exists")
 
-    try:
-        from PIL import Image  # type: ignore
-    except Exception:
+    if not _PIL_OK:
         return ConvertResult(
             src=src,
             dst=dst,
@@ -93,10 +258,7 @@ def _convert_one(
             reason="missing Pillow (pip install Pillow pillow-avif-plugin)",
         )
 
-    # Ensure AVIF plugin is registered (import side-effect)
-    try:
-        import pillow_avif  # type: ignore  # noqa: F401
-    except Exception:
+    if not _AVIF_OK:
         # Without plugin, Image.open will usually fail on AVIF
         return ConvertResult(
             src=src,
@@ -112,13 +274,9 @@ def _convert_one(
             icc_profile = im.info.get("icc_profile")
 
             # Convert to sRGB if ICC present (helps with "looks gray" mismatches)
-            if color_manage and icc_profile:
+            if color_manage and icc_profile and _CMS_OK:
                 try:
-                    from PIL import ImageCms  # type: ignore
-
-                    srgb = ImageCms.createProfile("sRGB")
-                    src_prof = ImageCms.ImageCmsProfile(io=icc_profile)
-                    im = ImageCms.profileToProfile(im, src_prof, srgb, outputMode=im.mode)
+                    im = ImageCms.applyTransform(im, _get_srgb_transform(icc_profile, im.mode))
                 except Exception:
                     # If color management fails, continue without it
                     pass
@@ -131,8 +289,10 @@ def _convert_one(
                 else:
                     im = im.convert("RGB")
 
-            _ensure_parent_dir(dst)
-            im.save(dst, format="PNG")
+            buf = io.BytesIO()
+            im.save(buf, format="PNG", compress_level=png_level, optimize=False)
+
+        _write_atomic(dst, buf)
 
     except Exception as e:
         return ConvertResult(src=src, dst=dst, ok=False, reason=f"convert failed: {e!r}")
@@ -140,7 +300,15 @@ def _convert_one(
     return ConvertResult(src=src, dst=dst, ok=True)
 
 
-def _default_out_path(src: Path, out_dir: Path | None, base_dir: Path | None) -> Path:
+def _default_out_path(
+    src: Path,
+    out_dir: Path | None,
+    base_dir: Path | None,
+    ext: str | None = None,
+) -> Path:
+    if ext is None:
+        ext = _ext_of(src.name)
+
     # If out_dir is provided, preserve relative structure from base_dir (if any)
     if out_dir is not None:
         if base_dir is not None:
@@ -153,7 +321,7 @@ def _default_out_path(src: Path, out_dir: Path | None, base_dir: Path | None) ->
 
         rel_path = Path(rel)
         # If the source is mislabeled .png but is AVIF, avoid overwriting by adding suffix
-        if rel_path.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp"):
+        if ext in _SUSPECT_EXTS:
             out_name = rel_path.with_suffix("").name + ".from_avif.png"
             rel_path = rel_path.with_name(out_name)
         else:
@@ -162,7 +330,7 @@ def _default_out_path(src: Path, out_dir: Path | None, base_dir: Path | None) ->
         return out_dir / rel_path
 
     # No out_dir: write next to source, but avoid overwriting if extension isn't .avif
-    if src.suffix.lower() == ".avif":
+    if ext == "avif":
         return src.with_suffix(".png")
 
     return src.with_suffix("").with_name(src.stem + ".from_avif.png")
@@ -192,6 +360,14 @@ def main(argv: list[str]) -> int:
         action="store_true",
         help="Disable ICC->sRGB conversion",
     )
+    parser.add_argument(
+        "--png-level",
+        type=int,
+        choices=range(10),
+        default=1,
+        metavar="{0..9}",
+        help="PNG zlib compression level (default 1: fast; 9: smallest files)",
+    )
 
     args = parser.parse_args(argv)
 
@@ -211,7 +387,14 @@ def main(argv: list[str]) -> int:
         print("No files found.")
         return 0
 
-    to_convert = [p for p in candidates if _is_probably_avif(p)]
+    # .avif is taken by extension; only the residual image-like files pay for a header read
+    sniff_all = input_path.is_file()
+    to_convert: list[tuple[Path, str]] = []
+    for p, ext, size in candidates:
+        if ext == "avif":
+            to_convert.append((p, ext))
+        elif (sniff_all or ext in _SUSPECT_EXTS) and _is_probably_avif(p, ext, size):
+            to_convert.append((p, ext))
     if not to_convert:
         print("No AVIF files detected (by extension or header).")
         return 0
@@ -220,25 +403,44 @@ def main(argv: list[str]) -> int:
     skipped = 0
     failed = 0
 
-    for src in to_convert:
-        dst = _default_out_path(src, out_dir=out_dir, base_dir=base_dir)
-        res = _convert_one(
-            src,
-            dst,
-            overwrite=bool(args.overwrite),
-            color_manage=not bool(args.no_color_management),
-        )
-
-        if res.ok:
-            ok += 1
-            print(f"OK   {res.src} -> {res.dst}")
-        else:
-            if res.reason == "dst exists":
-                skipped += 1
-                print(f"SKIP {res.src} -> {res.dst} ({res.reason})")
-            else:
-                failed += 1
-                print(f"FAIL {res.src} -> {res.dst} ({res.reason})")
+    overwrite = bool(args.overwrite)
+    color_manage = not bool(args.no_color_management)
+    png_level = int(args.png_level)
+
+    # Pillow releases the GIL while decoding AVIF / encoding PNG, so threads scale with cores.
+    # Results are printed in input order as soon as each prefix of the batch is finished.
+    results: dict[int, ConvertResult] = {}
+    next_to_print = 0
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        futures = {
+            pool.submit(
+                _convert_one,
+                src,
+                _default_out_path(src, out_dir=out_dir, base_dir=base_dir, ext=ext),
+                overwrite=overwrite,
+                color_manage=color_manage,
+                png_level=png_level,
+            ): i
+            for i, (src, ext) in enumerate(to_convert)
+        }
+
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+
+            while next_to_print in results:
+                res = results.pop(next_to_print)
+                next_to_print += 1
+
+                if res.ok:
+                    ok += 1
+                    print(f"OK   {res.src} -> {res.dst}")
+                else:
+                    if res.reason == "dst exists":
+                        skipped += 1
+                        print(f"SKIP {res.src} -> {res.dst} ({res.reason})")
+                    else:
+                        failed += 1
+                        print(f"FAIL {res.src} -> {res.dst} ({res.reason})")
 
     print(f"Done. ok={ok} skipped={skipped} failed={failed} total={len(to_convert)}")
     return 0 if failed == 0 else 1